@@ -0,0 +1,81 @@
+"""导入耗时基准测试
+
+每个场景都在新的解释器中执行，取多次运行的中位数，并记录加载了哪些较重的模块。
+传入--max-ms时，任一场景超出即以非零状态码退出，可用于CI中防止导入耗时回退：
+
+    python benchmarks/bench_import.py --repeat 7 --max-ms 150
+
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import fluentui": "import fluentui",
+    "one widget": "from fluentui.widgets import FPushButton",
+    "all widgets": "from fluentui.widgets import *",
+}
+
+# 只使用部分控件时不应被加载的模块
+HEAVY_MODULES = (
+    "PySide6.QtSvg",
+    "fluentui.widgets.menu",
+    "fluentui.framesless.linux",
+    "fluentui.framesless.macos",
+    "fluentui.framesless.windows",
+)
+
+SCRIPT = """
+import json, sys, time
+begin = time.perf_counter()
+{statement}
+elapsed = (time.perf_counter() - begin) * 1000
+print(json.dumps({{
+    "ms": elapsed,
+    "modules": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def run(statement: str) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    script = SCRIPT.format(statement=statement, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    results, failed = {}, False
+    for name, statement in SCENARIOS.items():
+        runs = [run(statement) for _ in range(args.repeat)]
+        median = statistics.median(r["ms"] for r in runs)
+        results[name] = {"median_ms": round(median, 2), "modules": runs[0]["modules"]}
+        if args.max_ms is not None and median > args.max_ms:
+            failed = True
+
+    print(json.dumps(results, indent=2))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
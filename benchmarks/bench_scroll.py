@@ -0,0 +1,255 @@
+"""滚动性能基准测试
+
+在offscreen平台下分别滚动FListWidget、FPlainTextEdit和FTextEdit，统计每帧耗时的分位数、
+每秒绘制事件数、每帧fluentui中Python代码的耗时以及内存占用，结果以稳定的JSON格式输出：
+
+    python benchmarks/bench_scroll.py --rows 10000,100000 --output scroll.json
+
+滚动方式（driver）：
+    drag    每帧直接setValue，相当于拖动FScrollBar的handle
+    wheel   每帧发送一次滚轮事件，仅FSmoothScrollBar
+
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+
+import PySide6
+from PySide6.QtCore import QEvent, QObject, QPoint, QPointF, Qt, qVersion
+from PySide6.QtGui import QWheelEvent
+from PySide6.QtWidgets import QApplication
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fluentui.widgets import FListWidget, FPlainTextEdit, FSmoothScrollBar, FTextEdit
+
+SCHEMA_VERSION = 1
+PACKAGE_DIR = os.path.join(ROOT, "fluentui")
+FRAME_TIME = 1 / 60
+
+WIDGETS = {
+    "FListWidget": FListWidget,
+    "FPlainTextEdit": FPlainTextEdit,
+    "FTextEdit": FTextEdit,
+}
+
+
+class PaintCounter(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self.count += 1
+        return False
+
+
+def create_widget(name: str, rows: int):
+    widget = WIDGETS[name]()
+    lines = [
+        f"Row {i} - The quick brown fox jumps over the lazy dog" for i in range(rows)
+    ]
+    if name == "FListWidget":
+        widget.addItems(lines)
+    else:
+        widget.setPlainText("\n".join(lines))
+
+    widget.resize(480, 640)
+    widget.show()
+    QApplication.processEvents()
+
+    return widget
+
+
+def scroll_bar_class(name: str) -> type:
+    widget = WIDGETS[name]()
+    bar_class = type(widget.scroll_bar_v)
+    widget.deleteLater()
+
+    return bar_class
+
+
+def run_frame(app: QApplication, apply_input) -> float:
+    """执行一帧，返回这一帧内实际处理事件的耗时（秒）"""
+
+    begin = time.perf_counter()
+    apply_input()
+    app.processEvents()
+    busy = time.perf_counter() - begin
+
+    # 剩余时间内继续处理事件，让动画和FrameClock按真实的帧间隔运行
+    while time.perf_counter() - begin < FRAME_TIME:
+        start = time.perf_counter()
+        app.processEvents()
+        busy += time.perf_counter() - start
+        time.sleep(0.0005)
+
+    return busy
+
+
+def make_input(widget, driver: str, frames: int):
+    bar = widget.scroll_bar_v
+    if driver == "drag":
+        step = max(1, (bar.maximum() - bar.minimum()) // frames)
+        return lambda: bar.setValue(bar.value + step)
+
+    def wheel() -> None:
+        event = QWheelEvent(
+            QPointF(10, 10),
+            QPointF(widget.mapToGlobal(QPoint(10, 10))),
+            QPoint(),
+            QPoint(0, -120),
+            Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier,
+            Qt.ScrollPhase.NoScrollPhase,
+            False,
+        )
+        QApplication.sendEvent(widget.viewport(), event)
+
+    return wheel
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def max_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS返回字节，Linux返回KB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def fluentui_time(profile: cProfile.Profile) -> float:
+    stats = pstats.Stats(profile)
+    return sum(
+        tottime
+        for (filename, _, _), (_, _, tottime, _, _) in stats.stats.items()
+        if filename.startswith(PACKAGE_DIR)
+    )
+
+
+def bench(app: QApplication, name: str, rows: int, driver: str, frames: int) -> dict:
+    widget = create_widget(name, rows)
+    bar = widget.scroll_bar_v
+
+    counter = PaintCounter()
+    widget.viewport().installEventFilter(counter)
+    bar.installEventFilter(counter)
+
+    # 计时
+    bar.setValue(bar.minimum())
+    if isinstance(bar, FSmoothScrollBar):
+        bar.resetCounters()
+    apply_input = make_input(widget, driver, frames)
+    begin = time.perf_counter()
+    frame_times = [run_frame(app, apply_input) for _ in range(frames)]
+    elapsed = time.perf_counter() - begin
+    paints = counter.count
+
+    result = {
+        "widget": name,
+        "scroll_bar": type(bar).__name__,
+        "driver": driver,
+        "rows": rows,
+        "frames": frames,
+        "frame_ms": {
+            "mean": round(sum(frame_times) / frames * 1000, 3),
+            "p50": round(percentile(frame_times, 50) * 1000, 3),
+            "p90": round(percentile(frame_times, 90) * 1000, 3),
+            "p99": round(percentile(frame_times, 99) * 1000, 3),
+            "max": round(max(frame_times) * 1000, 3),
+        },
+        "paints_per_second": round(paints / elapsed, 1),
+        "paints_per_frame": round(paints / frames, 3),
+    }
+    if isinstance(bar, FSmoothScrollBar):
+        result["wheel_events"] = bar.wheelEventCount()
+        result["animation_starts"] = bar.animationStartCount()
+
+    # 单独再跑一遍统计Python耗时和内存，避免分析器影响上面的帧耗时
+    bar.setValue(bar.minimum())
+    apply_input = make_input(widget, driver, frames)
+    profile = cProfile.Profile()
+    tracemalloc.start()
+    profile.enable()
+    for _ in range(frames):
+        run_frame(app, apply_input)
+    profile.disable()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result["python_ms_per_frame"] = round(fluentui_time(profile) / frames * 1000, 3)
+    result["python_peak_kb"] = peak // 1024
+    result["max_rss_kb"] = max_rss_kb()
+
+    widget.close()
+    widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000,1000000")
+    parser.add_argument("--widgets", default=",".join(WIDGETS))
+    parser.add_argument("--drivers", default="drag,wheel")
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = []
+    for name in args.widgets.split(","):
+        for rows in (int(rows) for rows in args.rows.split(",")):
+            for driver in args.drivers.split(","):
+                bar_class = scroll_bar_class(name)
+                if driver == "wheel" and not issubclass(bar_class, FSmoothScrollBar):
+                    continue
+                results.append(bench(app, name, rows, driver, args.frames))
+                print(f"{name} rows={rows} driver={driver} done", file=sys.stderr)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "pyside6": PySide6.__version__,
+            "qt": qVersion(),
+            "platform": platform.platform(),
+            "qpa": app.platformName(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
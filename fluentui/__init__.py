@@ -1,4 +1,30 @@
-from . import framesless, resources, utils, widgets
-from .resources import resources_rc
+from importlib import import_module
+
+from .resources import load_resources
+
+# QSS和图标都从Qt资源中读取，需要最先注册
+load_resources()
 
 __version__ = "0.1.0"
+
+# 子模块及常用名称在首次访问时才导入，只使用部分控件时不必加载全部控件、QtSvg及平台相关的无边框实现
+_SUBMODULES = ("framesless", "resources", "utils", "widgets")
+_ATTRIBUTES = {"install_styles": "utils"}
+
+__all__ = [*_SUBMODULES, *_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+
+    if name in _ATTRIBUTES:
+        value = getattr(import_module(f".{_ATTRIBUTES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
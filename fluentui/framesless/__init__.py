@@ -1,13 +1,48 @@
+import os
 import platform
+from importlib import import_module
 
 system = platform.system()
-if system == "Darwin":
-    from .macos import MacOSFramelessDialog as FramelessDialog
-    from .macos import MacOSFramelessMainWindow as FramelessMainWindow
-    from .macos import MacOSFramelessWidget as FramelessWidget
-elif system == "Windows":
-    from .windows import WindowsFrameDialog as FramelessDialog
-    from .windows import WindowsFramelessMainWindow as FramelessMainWindow
-    from .windows import WindowsFramesWidget as FramelessWidget
+# offscreen/minimal等无窗口系统的平台插件（如无头CI）统一使用通用实现
+headless = os.environ.get("QT_QPA_PLATFORM", "").split(":")[0] in (
+    "offscreen",
+    "minimal",
+)
+if system == "Darwin" and not headless:
+    _BACKEND = "macos"
+    _CLASSES = {
+        "FramelessDialog": "MacOSFramelessDialog",
+        "FramelessMainWindow": "MacOSFramelessMainWindow",
+        "FramelessWidget": "MacOSFramelessWidget",
+    }
+elif system == "Windows" and not headless:
+    _BACKEND = "windows"
+    _CLASSES = {
+        "FramelessDialog": "WindowsFrameDialog",
+        "FramelessMainWindow": "WindowsFramelessMainWindow",
+        "FramelessWidget": "WindowsFramesWidget",
+    }
 else:
-    raise ValueError("Unknown operating system")
+    # Linux(X11/Wayland)及其他系统
+    _BACKEND = "linux"
+    _CLASSES = {
+        "FramelessDialog": "LinuxFramelessDialog",
+        "FramelessMainWindow": "LinuxFramelessMainWindow",
+        "FramelessWidget": "LinuxFramelessWidget",
+    }
+
+__all__ = list(_CLASSES)
+
+
+def __getattr__(name: str):
+    # 平台实现依赖pyobjc/pywin32，首次使用时才导入
+    if name not in _CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{_BACKEND}", __name__), _CLASSES[name])
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,113 @@
+from PySide6.QtCore import QEvent, QObject, Qt
+from PySide6.QtGui import QMouseEvent, QResizeEvent, QShowEvent
+from PySide6.QtWidgets import QDialog, QMainWindow, QWidget
+
+from .title_bar import TitleBar
+
+_CURSORS = {
+    Qt.Edge.LeftEdge | Qt.Edge.TopEdge: Qt.CursorShape.SizeFDiagCursor,
+    Qt.Edge.RightEdge | Qt.Edge.BottomEdge: Qt.CursorShape.SizeFDiagCursor,
+    Qt.Edge.RightEdge | Qt.Edge.TopEdge: Qt.CursorShape.SizeBDiagCursor,
+    Qt.Edge.LeftEdge | Qt.Edge.BottomEdge: Qt.CursorShape.SizeBDiagCursor,
+    Qt.Edge.LeftEdge: Qt.CursorShape.SizeHorCursor,
+    Qt.Edge.RightEdge: Qt.CursorShape.SizeHorCursor,
+    Qt.Edge.TopEdge: Qt.CursorShape.SizeVerCursor,
+    Qt.Edge.BottomEdge: Qt.CursorShape.SizeVerCursor,
+}
+
+
+class FramelessHelper:
+    """X11/Wayland下的无边框窗口
+
+    移动和缩放都交给窗口管理器（startSystemMove/startSystemResize），
+    在offscreen等不支持这两个接口的平台上调用会直接返回False，因此同样可以使用
+
+    """
+
+    BORDER = 7
+
+    def __init__(self, parent=None) -> None:
+        super().__init__()
+
+        self.setWindowFlags(self.windowFlags() | Qt.WindowType.FramelessWindowHint)
+
+        self.title_bar = TitleBar(self)
+
+        self._enable_resize = True
+        self._window_handle = None
+
+    def showEvent(self, event: QShowEvent) -> None:
+        # 鼠标事件会先经过QWindow再分发给子控件，所以在QWindow上判断是否位于边框
+        # 修改windowFlags会重新创建QWindow，因此每次显示时检查
+        handle = self.windowHandle()
+        if handle is not self._window_handle:
+            handle.installEventFilter(self)
+            self._window_handle = handle
+
+        super().showEvent(event)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is not self._window_handle or not self._enable_resize:
+            return super().eventFilter(watched, event)
+
+        if event.type() == QEvent.Type.MouseMove:
+            edges = self._edges(event)
+            if edges in _CURSORS:
+                self.setCursor(_CURSORS[edges])
+            else:
+                self.unsetCursor()
+        elif (
+            event.type() == QEvent.Type.MouseButtonPress
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            edges = self._edges(event)
+            if edges and self._window_handle.startSystemResize(edges):
+                return True
+
+        return super().eventFilter(watched, event)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        self.title_bar.resize(self.width(), self.title_bar.height())
+        super().resizeEvent(event)
+
+    def _edges(self, event: QMouseEvent) -> Qt.Edge:
+        edges = Qt.Edge(0)
+        if self.isMaximized() or self.isFullScreen():
+            return edges
+
+        pos = event.position()
+        if pos.x() < self.BORDER:
+            edges |= Qt.Edge.LeftEdge
+        elif self.width() - self.BORDER < pos.x():
+            edges |= Qt.Edge.RightEdge
+        if pos.y() < self.BORDER:
+            edges |= Qt.Edge.TopEdge
+        elif self.height() - self.BORDER < pos.y():
+            edges |= Qt.Edge.BottomEdge
+
+        return edges
+
+
+class LinuxFramelessDialog(FramelessHelper, QDialog):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+
+        self._enable_resize = False
+
+        self.title_bar.btn_minimize.hide()
+        self.title_bar.btn_maximize.hide()
+        self.title_bar.setDoubleClickedEnabled(False)
+
+
+class LinuxFramelessMainWindow(FramelessHelper, QMainWindow):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+
+        self.setMenuWidget(self.title_bar)
+
+
+class LinuxFramelessWidget(FramelessHelper, QWidget):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+
+        self.setContentsMargins(0, 32, 0, 0)
@@ -0,0 +1,103 @@
+import os
+import re
+import shutil
+import subprocess
+from importlib import import_module
+from importlib.util import find_spec
+
+from PySide6.QtCore import QResource
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+_RCC_PATH = os.path.join(_DIR, "resources.rcc")
+_QRC_PATH = os.path.join(_DIR, "resources.qrc")
+
+_loaded = False
+# 包目录不可写时编译出的资源数据，Qt不会拷贝，需要一直持有
+_resource_data = None  # type: bytes | None
+
+
+def load_resources() -> None:
+    """注册QSS和图标等Qt资源
+
+    依次尝试：
+    1. resources.rcc，由Qt通过内存映射读取，不会在Python中再保存一份；
+       在源码目录下运行时，resources.qrc或其中的文件有修改才用pyside6-rcc重新编译
+    2. 构建时生成的resources_rc模块
+
+    """
+
+    global _loaded, _resource_data
+
+    if _loaded:
+        return
+
+    if _is_rcc_outdated():
+        data = _compile_resources()
+        if not _write_rcc(data):
+            _resource_data = data
+
+    if _resource_data is not None:
+        QResource.registerResourceData(_resource_data)
+    elif os.path.exists(_RCC_PATH) and QResource.registerResource(_RCC_PATH):
+        pass
+    elif find_spec(f"{__name__}.resources_rc") is not None:
+        import_module(".resources_rc", __name__)
+    else:
+        raise ImportError("fluentui resources are not compiled, reinstall the package")
+
+    _loaded = True
+
+
+def _is_rcc_outdated() -> bool:
+    """源码目录下的resources.rcc不存在或比资源文件旧"""
+
+    # 安装的包中没有resources.qrc，直接使用构建时生成的资源
+    if not os.path.exists(_QRC_PATH):
+        return False
+    if not os.path.exists(_RCC_PATH):
+        return True
+
+    with open(_QRC_PATH, encoding="utf-8") as f:
+        qrc = re.sub(r"<!--.*?-->", "", f.read(), flags=re.DOTALL)
+    files = re.findall(r"<file[^>]*>([^<]+)</file>", qrc)
+
+    rcc_mtime = os.path.getmtime(_RCC_PATH)
+    for path in [_QRC_PATH, *(os.path.join(_DIR, file) for file in files)]:
+        if os.path.exists(path) and os.path.getmtime(path) > rcc_mtime:
+            return True
+
+    return False
+
+
+def _write_rcc(data: bytes) -> bool:
+    """把编译结果缓存为resources.rcc，之后导入时不再运行pyside6-rcc"""
+
+    # 先写入临时文件再替换，避免其他进程读到不完整的文件
+    tmp_path = f"{_RCC_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, _RCC_PATH)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    return True
+
+
+def _compile_resources() -> bytes:
+    rcc = shutil.which("pyside6-rcc")
+    if rcc is None or not os.path.exists(_QRC_PATH):
+        raise ImportError(
+            "fluentui resources are not compiled, "
+            "reinstall the package or run: "
+            "pyside6-rcc --binary fluentui/resources/resources.qrc "
+            "-o fluentui/resources/resources.rcc"
+        )
+
+    return subprocess.run(
+        [rcc, "--binary", "--compress-algo", "zlib", _QRC_PATH],
+        check=True,
+        capture_output=True,
+    ).stdout
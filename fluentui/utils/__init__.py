@@ -1,6 +1,33 @@
 from .action import FAction
-from .color import FluentColor, ThemeColor
-from .font import get_font, set_font
-from .icon import FIcon, Icon, draw_icon
+from .color import FluentColor, ThemeColor, get_accent_color, set_accent_color
+from .font import font_metrics, get_font, set_font
+from .frame_clock import FrameClock, get_frame_clock
+from .icon import (
+    FIcon,
+    Icon,
+    IconEngine,
+    clear_icon_cache,
+    disable_icon_disk_cache,
+    draw_icon,
+    enable_icon_disk_cache,
+    prewarm,
+    save_icon_disk_cache,
+    set_icon_cache_limit,
+)
 from .screen import get_screen_geometry, move_to_screen_center
-from .style_sheet import FStyleSheet, StyleSheet
+from .shadow import (
+    FShadowEffect,
+    clear_shadow_cache,
+    draw_shadow,
+    set_shadow_cache_limit,
+)
+from .style_sheet import (
+    FStyleSheet,
+    StyleSheet,
+    Theme,
+    clear_style_sheet_cache,
+    get_theme,
+    install_styles,
+    refresh_style_sheets,
+    set_theme,
+)
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """按最近最少使用淘汰的缓存
+
+    与QCache类似，每个条目都有一个cost，总cost超过max_cost时从最久未使用的条目开始淘汰
+
+    """
+
+    def __init__(self, max_cost: int) -> None:
+        self._max_cost = max_cost
+        self._total_cost = 0
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, tuple[Any, int]]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        self._entries.move_to_end(key)
+
+        return entry[0]
+
+    def insert(self, key: Hashable, value: Any, cost: int = 1) -> bool:
+        self.remove(key)
+
+        # 单个条目就超出上限时不缓存，与QCache的行为一致
+        if cost > self._max_cost:
+            return False
+
+        self._entries[key] = (value, cost)
+        self._total_cost += cost
+        self._trim(self._max_cost)
+
+        return True
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_cost -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_cost = 0
+
+    def max_cost(self) -> int:
+        return self._max_cost
+
+    def set_max_cost(self, max_cost: int) -> None:
+        self._max_cost = max_cost
+        self._trim(max_cost)
+
+    def total_cost(self) -> int:
+        return self._total_cost
+
+    def _trim(self, max_cost: int) -> None:
+        while self._total_cost > max_cost and self._entries:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self._total_cost -= cost
@@ -1,6 +1,7 @@
 from enum import Enum
 
 from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
 
 
 class ThemeColor(Enum):
@@ -12,10 +13,14 @@ class ThemeColor(Enum):
     DARK_2 = "dark_2"
     DARK_3 = "dark_3"
 
-    def color(self):
-        color = QColor(0, 159, 170)
+    def color(self) -> QColor:
+        # 返回副本，避免调用方修改调色板中的颜色
+        return QColor(_palette[self])
+
+    def shade(self, accent: QColor) -> QColor:
+        """由强调色计算当前色阶"""
 
-        h, s, v, _ = color.getHsvF()
+        h, s, v, _ = accent.getHsvF()
 
         if self == self.LIGHT_1:  # (0, 167, 179)
             v *= 1.05
@@ -37,6 +42,43 @@ class ThemeColor(Enum):
         return QColor.fromHsvF(h, min(s, 1), min(v, 1))
 
 
+# 强调色及其各色阶，只在强调色变化时重新计算，避免在paintEvent中反复进行HSV转换
+_palette = {}  # type: dict[ThemeColor, QColor]
+
+
+def get_accent_color() -> QColor:
+    return ThemeColor.PRIMARY.color()
+
+
+def set_accent_color(color: "QColor | str | FluentColor") -> None:
+    """设置强调色，重新生成所有ThemeColor色阶并刷新QSS和控件"""
+
+    if isinstance(color, FluentColor):
+        color = color.color()
+    color = QColor(color)
+
+    # PRIMARY由HSV生成，QColor的==还会比较颜色空间，只能比较RGBA值
+    if _palette and color.rgba() == _palette[ThemeColor.PRIMARY].rgba():
+        return
+
+    _update_palette(color)
+
+    # style_sheet依赖本模块，在这里导入以避免循环导入
+    from .style_sheet import refresh_style_sheets
+
+    refresh_style_sheets()
+
+    app = QApplication.instance()
+    if app is not None:
+        for widget in app.allWidgets():
+            widget.update()
+
+
+def _update_palette(accent: QColor) -> None:
+    for theme_color in ThemeColor:
+        _palette[theme_color] = theme_color.shade(accent)
+
+
 class FluentColor(Enum):
     YELLOW_GOLD = "#FFB900"
     GOLD = "#FF8C00"
@@ -89,3 +131,6 @@ class FluentColor(Enum):
 
     def color(self) -> QColor:
         return QColor(self.value)
+
+
+_update_palette(QColor(0, 159, 170))
@@ -0,0 +1,139 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+from PySide6.QtGui import QImage
+
+
+class ImageDiskCache:
+    """保存在单个文件中的图片缓存
+
+    文件格式为：头部(magic, 索引长度) + JSON索引 + 连续存放的ARGB32_Premultiplied像素数据，
+    读取时通过mmap映射整个文件，只有命中的图片才会被拷贝出来
+
+    """
+
+    MAGIC = b"FLUIIMG1"
+    HEADER = struct.Struct("<8sQ")
+    FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file = None
+        self._mmap = None
+        self._index = {}  # type: dict[str, tuple[int, int, int]]
+        self._pending = {}  # type: dict[str, QImage]
+
+        self.load()
+
+    def path(self) -> str:
+        return self._path
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pending or key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index.keys() | self._pending.keys())
+
+    def load(self) -> None:
+        self.close()
+
+        try:
+            self._file = open(self._path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self._read_index(self._mmap)
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            # 文件不存在、为空或已损坏时当作空缓存处理
+            self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+        self._file = None
+        self._mmap = None
+        self._index = {}
+
+    def get(self, key: str) -> QImage | None:
+        image = self._pending.get(key)
+        if image is not None:
+            return image
+
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        offset, width, height = entry
+        size = width * height * 4
+        data = memoryview(self._mmap)[offset : offset + size]
+        # 拷贝一份，避免QImage引用mmap的内存
+        image = QImage(data, width, height, width * 4, self.FORMAT).copy()
+        data.release()
+
+        return image
+
+    def put(self, key: str, image: QImage) -> None:
+        if key in self:
+            return
+
+        self._pending[key] = image.convertToFormat(self.FORMAT)
+
+    def save(self) -> None:
+        if not self._pending:
+            return
+
+        entries = [(key, self.get(key)) for key in self._index]
+        entries.extend(self._pending.items())
+
+        index, offset = {"byteorder": sys.byteorder, "entries": {}}, 0
+        for key, image in entries:
+            index["entries"][key] = [offset, image.width(), image.height()]
+            offset += image.width() * image.height() * 4
+        index = json.dumps(index, separators=(",", ":")).encode()
+
+        # 先写临时文件再替换，且替换前需要先解除映射，否则Windows下无法替换
+        tmp_path = f"{self._path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        with open(tmp_path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(index)))
+            file.write(index)
+            for _, image in entries:
+                file.write(self._image_data(image))
+
+        self.close()
+        os.replace(tmp_path, self._path)
+        self._pending.clear()
+        self.load()
+
+    def _read_index(self, data: mmap.mmap) -> dict[str, tuple[int, int, int]]:
+        magic, length = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Invalid image cache file")
+
+        begin = self.HEADER.size
+        index = json.loads(data[begin : begin + length])
+        if index["byteorder"] != sys.byteorder:
+            raise ValueError("Image cache file was written on another platform")
+
+        # 索引中的偏移量是相对于像素数据起始位置的
+        base = begin + length
+        return {
+            key: (base + offset, width, height)
+            for key, (offset, width, height) in index["entries"].items()
+        }
+
+    @staticmethod
+    def _image_data(image: QImage) -> bytes:
+        width = image.width() * 4
+        data = image.constBits().tobytes()
+        if image.bytesPerLine() == width:
+            return data[: width * image.height()]
+
+        bpl = image.bytesPerLine()
+        return b"".join(
+            data[row * bpl : row * bpl + width] for row in range(image.height())
+        )
@@ -1,7 +1,7 @@
 from enum import Enum
 from platform import system
 
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QFontMetrics
 from PySide6.QtWidgets import QWidget
 
 
@@ -9,10 +9,43 @@ class FFont:
     class Serif(Enum):
         MACOS = ["SF Pro", "PingFang SC"]
         WINDOWS = ["Segoe UI", "Microsoft YaHei"]
+        LINUX = ["Noto Sans", "Noto Sans CJK SC", "DejaVu Sans", "Cantarell"]
 
     class Mono(Enum):
         MACOS = ["SF Mono", "Menlo"]
         WINDOWS = ["Consolas"]
+        LINUX = ["Noto Sans Mono", "DejaVu Sans Mono"]
+
+
+# 操作系统不会在运行时变化，字体族只解析一次，key为mono
+_families = {}  # type: dict[bool, list[str]]
+# key为(mono, font_size, weight, italic)
+_font_cache = {}  # type: dict[tuple[bool, float, QFont.Weight, bool], QFont]
+# key为QFont.key()
+_metrics_cache = {}  # type: dict[str, QFontMetrics]
+
+
+def _font_families(mono: bool) -> list[str]:
+    families = _families.get(mono)
+    if families is not None:
+        return families
+
+    os = system()
+    if os == "Darwin":
+        serif, monospace = FFont.Serif.MACOS, FFont.Mono.MACOS
+    elif os == "Windows":
+        serif, monospace = FFont.Serif.WINDOWS, FFont.Mono.WINDOWS
+    else:
+        # Linux及其他类Unix系统
+        serif, monospace = FFont.Serif.LINUX, FFont.Mono.LINUX
+
+    families = []
+    if mono:
+        families.extend(monospace.value)
+    families.extend(serif.value)
+
+    _families[mono] = families
+    return families
 
 
 def get_font(
@@ -21,24 +54,27 @@ def get_font(
     weight: QFont.Weight = QFont.Weight.Normal,
     italic: bool = False,
 ) -> QFont:
-    os = system()
-    if os == "Darwin":
-        families = []
-        if mono:
-            families.extend(FFont.Mono.MACOS.value)
-        families.extend(FFont.Serif.MACOS.value)
-    elif os == "Windows":
-        families = []
-        if mono:
-            families.extend(FFont.Mono.WINDOWS.value)
-        families.extend(FFont.Serif.WINDOWS.value)
-    else:
-        raise ValueError("Unknown operating system")
+    key = (mono, font_size, weight, italic)
+    font = _font_cache.get(key)
+    if font is None:
+        font = QFont(_font_families(mono), weight=weight, italic=italic)
+        font.setPointSizeF(font_size)
+        _font_cache[key] = font
+
+    # QFont是隐式共享的，返回副本的开销很小，且调用方修改时不会影响缓存
+    return QFont(font)
+
+
+def font_metrics(font: QFont) -> QFontMetrics:
+    """获取缓存的QFontMetrics，用于频繁测量文字宽度的地方"""
 
-    font = QFont(families, weight=weight, italic=italic)
-    font.setPointSizeF(font_size)
+    key = font.key()
+    metrics = _metrics_cache.get(key)
+    if metrics is None:
+        metrics = QFontMetrics(font)
+        _metrics_cache[key] = metrics
 
-    return font
+    return metrics
 
 
 def set_font(
@@ -0,0 +1,67 @@
+from typing import Callable
+
+from PySide6.QtCore import QElapsedTimer, QObject, Qt, QTimer
+from PySide6.QtGui import QGuiApplication
+
+
+class FrameClock(QObject):
+    """按屏幕刷新率触发的共享时钟
+
+    所有订阅者共用一个QTimer，每帧最多回调一次，回调参数为距上一帧的秒数；
+    没有订阅者时计时器停止，不产生空转
+
+    """
+
+    # 两帧间隔过长时（如窗口被拖动阻塞）限制dt，避免动画跳变
+    MAX_DELTA = 0.05
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+
+        self._callbacks = {}  # type: dict[Callable[[float], None], None]
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+        self._elapsed = QElapsedTimer()
+
+    def interval(self) -> int:
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 60
+        return max(1, round(1000 / max(refresh_rate, 1)))
+
+    def isActive(self) -> bool:
+        return self._timer.isActive()
+
+    def subscribe(self, callback: Callable[[float], None]) -> None:
+        if callback in self._callbacks:
+            return
+
+        self._callbacks[callback] = None
+        if not self._timer.isActive():
+            self._elapsed.start()
+            self._timer.start(self.interval())
+
+    def unsubscribe(self, callback: Callable[[float], None]) -> None:
+        self._callbacks.pop(callback, None)
+        if not self._callbacks:
+            self._timer.stop()
+
+    def _on_timeout(self) -> None:
+        dt = min(self._elapsed.restart() / 1000, self.MAX_DELTA)
+        # 回调中可能会取消订阅
+        for callback in list(self._callbacks):
+            callback(dt)
+
+
+_frame_clock = None  # type: FrameClock | None
+
+
+def get_frame_clock() -> FrameClock:
+    global _frame_clock
+
+    if _frame_clock is None:
+        _frame_clock = FrameClock(QGuiApplication.instance())
+
+    return _frame_clock
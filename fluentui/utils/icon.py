@@ -1,18 +1,184 @@
+import re
+import zlib
 from enum import Enum
+from math import ceil
+from typing import Iterable
 
-from PySide6.QtCore import QFile, QRect, QRectF, Qt
-from PySide6.QtGui import QIcon, QPainter
+import shiboken6
+from PySide6.QtCore import (
+    QCoreApplication,
+    QFile,
+    QLibraryInfo,
+    QObject,
+    QRect,
+    QRectF,
+    QSize,
+    Qt,
+    QThreadPool,
+    Signal,
+)
+from PySide6.QtGui import QIcon, QIconEngine, QImage, QPainter, QPixmap
 from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtXml import QDomDocument
+
+from .cache import LRUCache
+from .disk_cache import ImageDiskCache
+
+# 栅格化后的图标缓存，key为(path, 像素宽, 像素高, devicePixelRatio, 填充色)
+_pixmap_cache = LRUCache(16 * 1024 * 1024)
+# 解析后的SVG，key为(path, 填充色)
+_renderer_cache = LRUCache(256)
+# SVG模板，key为path，value为(原始数据, 按<path>的fill属性值切分后的片段, 原始数据的crc32)
+_svg_templates = {}  # type: dict[str, tuple[bytes, list[bytes], int]]
+# 共享的QIcon，key为(path, 填充色)，保证同一个图标在各处的cacheKey一致
+_icons = {}  # type: dict[tuple[str, str | None], QIcon]
+# 可选的磁盘缓存，用于跨进程复用栅格化结果
+_disk_cache = None  # type: ImageDiskCache | None
+# clone出的IconEngine，由QIcon析构时Qt删除，之后在下一次clone时清理
+_cloned_engines = []  # type: list[IconEngine]
+# 是否已连接aboutToQuit，在程序退出时保存磁盘缓存
+_save_on_quit = False
+
+_PATH_FILL_PATTERN = re.compile(rb'<path\b[^>]*?\bfill="([^"]*)"')
+
+# Qt 6.8起QIcon传给QIconEngine.scaledPixmap的是逻辑尺寸，之前是物理像素尺寸
+_QT_VERSION = QLibraryInfo.version()
+_SCALED_PIXMAP_LOGICAL_SIZE = (
+    _QT_VERSION.majorVersion(),
+    _QT_VERSION.minorVersion(),
+) >= (6, 8)
+
+
+def set_icon_cache_limit(limit: int) -> None:
+    """设置图标缓存的内存上限，单位为字节"""
+
+    _pixmap_cache.set_max_cost(limit)
+
+
+def clear_icon_cache() -> None:
+    _pixmap_cache.clear()
+    _renderer_cache.clear()
+
+
+def enable_icon_disk_cache(path: str) -> None:
+    """启用图标的磁盘缓存
+
+    缓存文件中已有的图标直接通过mmap读取，不再解析SVG；
+    新栅格化的图标在save_icon_disk_cache或程序退出时写入该文件；
+    在创建QApplication之前调用时，会在之后首次读取或栅格化图标时再连接退出信号
+
+    """
+
+    global _disk_cache
+
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = ImageDiskCache(path)
+
+    _connect_save_on_quit()
+
+
+def disable_icon_disk_cache() -> None:
+    global _disk_cache
+
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = None
+
+
+def save_icon_disk_cache() -> None:
+    if _disk_cache is None:
+        return
+
+    for key, (pixmap, source) in _pixmap_cache.items():
+        disk_key = _disk_key(key)
+        if disk_key not in _disk_cache:
+            _disk_cache.put(disk_key, pixmap.copy(source).toImage())
+
+    _disk_cache.save()
+
+
+def _connect_save_on_quit() -> None:
+    global _save_on_quit
+
+    if _save_on_quit:
+        return
+
+    app = QCoreApplication.instance()
+    if app is not None:
+        app.aboutToQuit.connect(save_icon_disk_cache)
+        _save_on_quit = True
+
+
+def _disk_key(key: tuple) -> str:
+    # 加上SVG内容的校验值，资源更新后旧的缓存自然失效
+    path, width, height, dpr, color = key
+    crc = _svg_template(path)[2]
+
+    return f"{path}:{crc:08x}:{width}x{height}@{dpr:g}:{color}"
+
+
+def _svg_template(path: str) -> tuple[bytes, list[bytes], int]:
+    template = _svg_templates.get(path)
+    if template is not None:
+        return template
+
+    svg_file = QFile(path)
+    svg_file.open(QFile.OpenModeFlag.ReadOnly)
+    svg = svg_file.readAll().data()
+    svg_file.close()
+
+    segments, pos = [], 0
+    for match in _PATH_FILL_PATTERN.finditer(svg):
+        segments.append(svg[pos : match.start(1)])
+        pos = match.end(1)
+    segments.append(svg[pos:])
+
+    template = _svg_templates[path] = (svg, segments, zlib.crc32(svg))
+
+    return template
 
 
 class Icon:
-    def icon(self) -> QIcon:
-        return QIcon(self.path())
+    def icon(self, fill: str = None) -> QIcon:
+        key = (self.path(), fill)
+        icon = _icons.get(key)
+        if icon is None:
+            icon = QIcon(IconEngine(self, fill))
+            _icons[key] = icon
+
+        return icon
 
     def path(self) -> str:
         raise NotImplementedError
 
+    def pixmap(
+        self,
+        width: int,
+        height: int,
+        device_pixel_ratio: float = 1.0,
+        state: QIcon.State = QIcon.State.Off,
+        fill: str = None,
+    ) -> QPixmap:
+        """获取栅格化后的图标，width和height为物理像素尺寸"""
+
+        key = (
+            self.path(),
+            width,
+            height,
+            device_pixel_ratio,
+            self._fill_color(state, fill),
+        )
+        pixmap, source = self._cached_pixmap(key)
+        if source == pixmap.rect():
+            return pixmap
+
+        # 位于图集中的图标需要单独拷贝出来，并替换掉缓存中的条目
+        pixmap = pixmap.copy(source)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        _pixmap_cache.insert(key, (pixmap, pixmap.rect()), width * height * 4)
+
+        return pixmap
+
     def render(
         self,
         painter: QPainter,
@@ -20,26 +186,151 @@ class Icon:
         state: QIcon.State,
         fill: str = None,
     ) -> None:
-        svg_file = QFile(self.path())
-        svg_file.open(QFile.OpenModeFlag.ReadOnly)
-        svg = svg_file.readAll()
-        svg_file.close()
+        rect = QRectF(rect)
+
+        # 有缩放或旋转时缓存的像素无法对齐，直接绘制矢量图
+        transform = painter.combinedTransform()
+        if transform.isScaling() or transform.isRotating():
+            self._renderer(self._fill_color(state, fill)).render(painter, rect)
+            return
+
+        dpr = painter.device().devicePixelRatioF()
+        width = ceil(rect.width() * dpr)
+        height = ceil(rect.height() * dpr)
+        if width <= 0 or height <= 0:
+            return
+
+        key = (self.path(), width, height, dpr, self._fill_color(state, fill))
+        pixmap, source = self._cached_pixmap(key)
+        painter.drawPixmap(rect, pixmap, QRectF(source))
+
+    def _cached_pixmap(self, key: tuple) -> tuple[QPixmap, QRect]:
+        # 缓存的值为(pixmap, 图标在pixmap中的区域)，预热生成的图集中多个图标共用一张pixmap
+        entry = _pixmap_cache.get(key)
+        if entry is None:
+            if _disk_cache is not None:
+                _connect_save_on_quit()
+
+            _, width, height, dpr, color = key
+            pixmap = self._disk_pixmap(key)
+            if pixmap is None:
+                pixmap = self._rasterize(width, height, dpr, color)
+            entry = (pixmap, pixmap.rect())
+            _pixmap_cache.insert(key, entry, width * height * 4)
+
+        return entry
+
+    @staticmethod
+    def _disk_pixmap(key: tuple) -> QPixmap | None:
+        if _disk_cache is None:
+            return None
+
+        image = _disk_cache.get(_disk_key(key))
+        if image is None:
+            return None
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(key[3])
+
+        return pixmap
+
+    @staticmethod
+    def _fill_color(state: QIcon.State, fill: str | None) -> str | None:
+        return "#F3F3F3" if state == QIcon.State.On else fill
 
-        if state == QIcon.State.On or fill is not None:
-            color = "#F3F3F3" if state == QIcon.State.On else fill
+    def _rasterize(
+        self, width: int, height: int, device_pixel_ratio: float, color: str | None
+    ) -> QPixmap:
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.GlobalColor.transparent)
 
-            dom = QDomDocument()
-            dom.setContent(svg)
-            node_list = dom.elementsByTagName("path")
-            for i in range(node_list.length()):
-                path_nodel = node_list.item(i)
-                fill_node = path_nodel.attributes().namedItem("fill")
-                fill_node.setNodeValue(color)
-            svg = dom.toByteArray()
+        painter = QPainter(pixmap)
+        painter.setRenderHints(
+            QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+        )
+        self._renderer(color).render(painter, QRectF(0, 0, width, height))
+        painter.end()
 
-        renderer = QSvgRenderer(svg)
-        renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
-        renderer.render(painter, rect)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+
+        return pixmap
+
+    def _renderer(self, color: str | None) -> QSvgRenderer:
+        key = (self.path(), color)
+        renderer = _renderer_cache.get(key)
+        if renderer is None:
+            renderer = QSvgRenderer(self._svg_data(color))
+            renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+            _renderer_cache.insert(key, renderer)
+
+        return renderer
+
+    def _svg_data(self, color: str | None) -> bytes:
+        svg, segments, _ = _svg_template(self.path())
+        if color is None:
+            return svg
+
+        # 直接替换所有<path>的fill属性值，代替原来用QDomDocument逐个节点修改的做法
+        return color.encode().join(segments)
+
+
+class IconEngine(QIconEngine):
+    DISABLED_OPACITY = 0.3628
+
+    def __init__(self, icon: Icon, fill: str = None) -> None:
+        super().__init__()
+
+        self._icon = icon
+        self._fill = fill
+
+    def clone(self) -> QIconEngine:
+        # QIcon持有返回的C++对象，但PySide不会把所有权转交给C++，
+        # Python对象被回收后QIcon中就是悬空指针，需要一直持有到Qt将其析构
+        _cloned_engines[:] = [e for e in _cloned_engines if shiboken6.isValid(e)]
+
+        engine = IconEngine(self._icon, self._fill)
+        _cloned_engines.append(engine)
+
+        return engine
+
+    def key(self) -> str:
+        return "fluentui"
+
+    def paint(
+        self, painter: QPainter, rect: QRect, mode: QIcon.Mode, state: QIcon.State
+    ) -> None:
+        painter.save()
+        if mode == QIcon.Mode.Disabled:
+            painter.setOpacity(painter.opacity() * self.DISABLED_OPACITY)
+        self._icon.render(painter, rect, state, self._fill)
+        painter.restore()
+
+    def pixmap(self, size: QSize, mode: QIcon.Mode, state: QIcon.State) -> QPixmap:
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def scaledPixmap(
+        self, size: QSize, mode: QIcon.Mode, state: QIcon.State, scale: float
+    ) -> QPixmap:
+        if _SCALED_PIXMAP_LOGICAL_SIZE:
+            width, height = ceil(size.width() * scale), ceil(size.height() * scale)
+        else:
+            width, height = size.width(), size.height()
+        if width <= 0 or height <= 0:
+            return QPixmap()
+
+        pixmap = self._icon.pixmap(width, height, scale, state, self._fill)
+        if mode != QIcon.Mode.Disabled:
+            return pixmap
+
+        disabled = QPixmap(pixmap.size())
+        disabled.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(disabled)
+        painter.setOpacity(self.DISABLED_OPACITY)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        disabled.setDevicePixelRatio(scale)
+
+        return disabled
 
 
 class FIcon(Icon, Enum):
@@ -113,3 +404,142 @@ def draw_icon(
     else:
         rect = rect if isinstance(rect, QRect) else rect.toRect()
         icon.paint(painter, rect, state=state)
+
+
+class IconAtlasTask(QObject):
+    """把一批图标栅格化到同一张图集中，并写入图标缓存"""
+
+    MAX_WIDTH = 2048
+    SPACING = 1  # 图标之间留空，防止平滑缩放时采样到相邻的图标
+
+    finished = Signal()
+    _built = Signal(QImage, list)
+
+    def __init__(self, jobs: list[tuple[Icon, tuple]], parent=None) -> None:
+        super().__init__(parent=parent)
+
+        self._jobs = jobs
+
+        self._built.connect(self._install)
+
+    def start(self, background: bool = False) -> None:
+        if background:
+            _atlas_tasks.add(self)
+            QThreadPool.globalInstance().start(self._build)
+        else:
+            image, rects = self._render()
+            self._install(image, rects)
+
+    def _build(self) -> None:
+        # 在工作线程中执行，只能使用QImage，QPixmap需要回到主线程再创建
+        image, rects = self._render()
+        self._built.emit(image, rects)
+
+    def _render(self) -> tuple[QImage, list[QRect]]:
+        rects, width, height = self._pack([key[1:3] for _, key in self._jobs])
+
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
+        painter.setRenderHints(
+            QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+        )
+
+        renderers = {}  # type: dict[tuple[str, str | None], QSvgRenderer]
+        for (icon, key), rect in zip(self._jobs, rects):
+            path, _, _, _, color = key
+            renderer = renderers.get((path, color))
+            if renderer is None:
+                # 各线程各自创建QSvgRenderer，不使用主线程中的缓存
+                renderer = QSvgRenderer(icon._svg_data(color))
+                renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+                renderers[(path, color)] = renderer
+            renderer.render(painter, QRectF(rect))
+
+        painter.end()
+
+        return image, rects
+
+    def _pack(self, sizes: list[tuple[int, int]]) -> tuple[list[QRect], int, int]:
+        # 简单的货架算法：按高度从大到小逐行排列
+        order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+        rects = [QRect()] * len(sizes)
+
+        x = y = shelf_height = width = 0
+        for i in order:
+            w, h = sizes[i]
+            if x > 0 and x + w > self.MAX_WIDTH:
+                x = 0
+                y += shelf_height + self.SPACING
+                shelf_height = 0
+
+            rects[i] = QRect(x, y, w, h)
+            x += w + self.SPACING
+            shelf_height = max(shelf_height, h)
+            width = max(width, x - self.SPACING)
+
+        return rects, width, y + shelf_height
+
+    def _install(self, image: QImage, rects: list[QRect]) -> None:
+        atlas = QPixmap.fromImage(image)
+        for (_, key), rect in zip(self._jobs, rects):
+            _pixmap_cache.insert(key, (atlas, rect), rect.width() * rect.height() * 4)
+
+        _atlas_tasks.discard(self)
+        self.finished.emit()
+
+
+# 后台执行中的任务，防止被回收
+_atlas_tasks = set()  # type: set[IconAtlasTask]
+
+
+def prewarm(
+    sizes: Iterable[int] = (16, 20, 24),
+    device_pixel_ratios: Iterable[float] = (1.0,),
+    fills: Iterable[str | None] = (None,),
+    states: Iterable[QIcon.State] = (QIcon.State.Off,),
+    icons: Iterable[Icon] = None,
+    background: bool = False,
+) -> IconAtlasTask | None:
+    """预热图标缓存
+
+    把icons（默认为全部FIcon）在各尺寸、缩放比例、填充色和状态下的组合一次性绘制到一张图集中，
+    之后首次绘制这些图标时即可直接命中缓存。background为True时在线程池中绘制，
+    完成后发出返回值的finished信号；没有需要绘制的图标时返回None
+
+    """
+
+    icons = list(FIcon) if icons is None else list(icons)
+    sizes, device_pixel_ratios, fills, states = (
+        list(sizes),
+        list(device_pixel_ratios),
+        list(fills),
+        list(states),
+    )
+
+    jobs, keys = [], set()
+    for icon in icons:
+        for size in sizes:
+            for dpr in device_pixel_ratios:
+                px = ceil(size * dpr)
+                for state in states:
+                    for fill in fills:
+                        key = (icon.path(), px, px, dpr, Icon._fill_color(state, fill))
+                        if key in keys or key in _pixmap_cache:
+                            continue
+
+                        keys.add(key)
+                        if _disk_cache is not None and _disk_key(key) in _disk_cache:
+                            # 磁盘缓存中已有的直接读取
+                            icon._cached_pixmap(key)
+                        else:
+                            jobs.append((icon, key))
+
+    if not jobs:
+        return None
+
+    task = IconAtlasTask(jobs)
+    task.start(background)
+
+    return task
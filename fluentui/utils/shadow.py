@@ -0,0 +1,215 @@
+from math import ceil
+
+from PySide6.QtCore import QEvent, QObject, QPoint, QPointF, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPixmap
+from PySide6.QtWidgets import (
+    QGraphicsBlurEffect,
+    QGraphicsPathItem,
+    QGraphicsScene,
+    QWidget,
+)
+
+from .cache import LRUCache
+
+_shadow_cache = LRUCache(4 * 1024 * 1024)
+
+
+def set_shadow_cache_limit(limit: int) -> None:
+    """设置阴影缓存的最大字节数"""
+
+    _shadow_cache.set_max_cost(limit)
+
+
+def clear_shadow_cache() -> None:
+    _shadow_cache.clear()
+
+
+def draw_shadow(
+    painter: QPainter,
+    rect: QRect,
+    blur_radius: float,
+    offset: QPoint,
+    color: QColor,
+    border_radius: float = 0,
+) -> None:
+    """在rect外围绘制圆角矩形的阴影，效果与QGraphicsDropShadowEffect一致
+
+    阴影只按(模糊半径, 颜色, 圆角半径, 缩放比例)模糊一次并缓存为九宫格图片，
+    之后任意大小的rect都只拉伸绘制这一张图片
+
+    """
+
+    margin = ceil(blur_radius)
+    # 角上的区域要包含圆角以及向内外各扩散margin的模糊
+    corner = 2 * margin + ceil(border_radius)
+    target = QRect(rect).translated(offset).adjusted(-margin, -margin, margin, margin)
+    dpr = painter.device().devicePixelRatioF()
+
+    key = (blur_radius, color.rgba(), border_radius, dpr)
+    pixmap = _shadow_cache.get(key)
+    if pixmap is None:
+        pixmap = _render_shadow(blur_radius, color, border_radius, dpr, corner)
+        _shadow_cache.insert(key, pixmap, pixmap.width() * pixmap.height() * 4)
+
+    _draw_nine_slice(painter, QRectF(target), pixmap, corner, dpr)
+
+
+def _render_shadow(
+    blur_radius: float,
+    color: QColor,
+    border_radius: float,
+    dpr: float,
+    corner: int,
+) -> QPixmap:
+    # 中间只留1像素，与角之间的距离足以让这1像素的模糊结果等同于无限长的直边
+    size = 2 * corner + 1
+    margin = ceil(blur_radius)
+    path = QPainterPath()
+    path.addRoundedRect(
+        QRectF(margin, margin, size - 2 * margin, size - 2 * margin),
+        border_radius,
+        border_radius,
+    )
+
+    # 借助QGraphicsScene使用Qt自带的模糊，与QGraphicsDropShadowEffect的模糊算法相同
+    item = QGraphicsPathItem(path)
+    item.setPen(Qt.PenStyle.NoPen)
+    item.setBrush(color)
+
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur_radius)
+    effect.setBlurHints(QGraphicsBlurEffect.BlurHint.QualityHint)
+    item.setGraphicsEffect(effect)
+
+    scene = QGraphicsScene(0, 0, size, size)
+    scene.addItem(item)
+
+    image = QImage(
+        round(size * dpr),
+        round(size * dpr),
+        QImage.Format.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+    painter.end()
+
+    return QPixmap.fromImage(image)
+
+
+def _slices(start: float, length: float, corner: int) -> tuple[list, list]:
+    """一个方向上三段的(源起点, 源终点)和(目标起点, 目标终点)
+
+    目标不足两个角的长度时，两端的角只取靠外的一半，中间一段不绘制
+
+    """
+
+    size = 2 * corner + 1
+    edge = min(corner, length / 2)
+    sources = [(0, edge), (corner, corner + 1), (size - edge, size)]
+    targets = [
+        (start, start + edge),
+        (start + edge, start + length - edge),
+        (start + length - edge, start + length),
+    ]
+
+    return sources, targets
+
+
+def _draw_nine_slice(
+    painter: QPainter, target: QRectF, pixmap: QPixmap, corner: int, dpr: float
+) -> None:
+    x_sources, x_targets = _slices(target.x(), target.width(), corner)
+    y_sources, y_targets = _slices(target.y(), target.height(), corner)
+
+    for (sx0, sx1), (tx0, tx1) in zip(x_sources, x_targets):
+        for (sy0, sy1), (ty0, ty1) in zip(y_sources, y_targets):
+            if tx1 <= tx0 or ty1 <= ty0:
+                continue
+
+            source = QRectF(
+                QPointF(sx0 * dpr, sy0 * dpr), QPointF(sx1 * dpr, sy1 * dpr)
+            )
+            painter.drawPixmap(
+                QRectF(QPointF(tx0, ty0), QPointF(tx1, ty1)), pixmap, source
+            )
+
+
+class FShadowEffect(QObject):
+    """在控件下方绘制阴影，替代QGraphicsDropShadowEffect
+
+    QGraphicsDropShadowEffect每次重绘都会把整个控件渲染到离屏缓冲再模糊，
+    这里由父控件在控件所在位置绘制缓存的阴影图片，控件自身的重绘不再有额外开销；
+    父控件需要设置WA_TranslucentBackground，并在控件外留出足够的边距
+
+    """
+
+    def __init__(self, widget: QWidget) -> None:
+        super().__init__(parent=widget)
+
+        self._widget = widget
+        self._blur_radius = 1.0
+        self._offset = QPoint(8, 8)
+        self._color = QColor(63, 63, 63, 180)
+        self._border_radius = 0.0
+
+        widget.installEventFilter(self)
+        widget.parentWidget().installEventFilter(self)
+
+    def blurRadius(self) -> float:
+        return self._blur_radius
+
+    def setBlurRadius(self, radius: float) -> None:
+        self._blur_radius = radius
+        self._update()
+
+    def offset(self) -> QPoint:
+        return QPoint(self._offset)
+
+    def setOffset(self, x: int, y: int) -> None:
+        self._offset = QPoint(x, y)
+        self._update()
+
+    def color(self) -> QColor:
+        return QColor(self._color)
+
+    def setColor(self, color: QColor) -> None:
+        self._color = QColor(color)
+        self._update()
+
+    def borderRadius(self) -> float:
+        return self._border_radius
+
+    def setBorderRadius(self, radius: float) -> None:
+        """与控件QSS中的border-radius保持一致"""
+
+        self._border_radius = radius
+        self._update()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self._widget:
+            if event.type() in (QEvent.Type.Move, QEvent.Type.Resize):
+                self._update()
+        elif event.type() == QEvent.Type.Paint and self._widget.isVisible():
+            # 在父控件自身的paintEvent之前绘制，阴影位于最下层
+            painter = QPainter(watched)
+            painter.setClipRegion(event.region())
+            draw_shadow(
+                painter,
+                self._widget.geometry(),
+                self._blur_radius,
+                self._offset,
+                self._color,
+                self._border_radius,
+            )
+            painter.end()
+
+        return super().eventFilter(watched, event)
+
+    def _update(self) -> None:
+        parent = self._widget.parentWidget()
+        if parent is not None:
+            parent.update()
@@ -1,22 +1,275 @@
+import re
 from enum import Enum
+from weakref import WeakKeyDictionary
 
+import shiboken6
 from PySide6.QtCore import QFile
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QApplication, QWidget
+
+from .color import ThemeColor
+
+
+class Theme(Enum):
+    LIGHT = "light"
+    DARK = "dark"
+
+
+# QSS模板中与主题相关的变量，强调色相关的变量由ThemeColor生成
+_THEME_VARIABLES = {
+    Theme.LIGHT: {
+        "text": "black",
+        "text_secondary": "rgba(0, 0, 0, 0.7)",
+        "text_tertiary": "rgb(96, 96, 96)",
+        "text_pressed": "rgba(0, 0, 0, 0.63)",
+        "text_disabled": "rgba(0, 0, 0, 0.36)",
+        "text_on_accent": "white",
+        "text_on_accent_pressed": "rgba(255, 255, 255, 0.63)",
+        "text_on_accent_disabled": "rgba(255, 255, 255, 0.9)",
+        "accent_disabled": "rgb(205, 205, 205)",
+        "background": "rgb(243, 243, 243)",
+        "surface": "white",
+        "divider": "rgb(229, 229, 229)",
+        "stroke_subtle": "rgba(0, 0, 0, 0.06)",
+        "control_fill": "rgba(255, 255, 255, 0.7)",
+        "control_fill_hover": "rgba(249, 249, 249, 0.5)",
+        "control_fill_pressed": "rgba(249, 249, 249, 0.3)",
+        "control_fill_disabled": "rgba(249, 249, 249, 0.3)",
+        "control_stroke": "rgba(0, 0, 0, 0.073)",
+        "control_stroke_bottom": "rgba(0, 0, 0, 0.183)",
+        "subtle_fill_hover": "rgba(0, 0, 0, 9)",
+        "subtle_fill_pressed": "rgba(0, 0, 0, 6)",
+        "subtle_fill_selected": "rgba(0, 0, 0, 7)",
+        "subtle_fill_selected_active": "rgba(0, 0, 0, 0.06)",
+        "input_stroke": "rgba(0, 0, 0, 13)",
+        "input_stroke_bottom": "rgba(0, 0, 0, 100)",
+        "input_text_disabled": "rgba(0, 0, 0, 150)",
+        "flyout_background": "rgb(249, 249, 249)",
+        "flyout_stroke": "rgba(0, 0, 0, 0.1)",
+        "dialog_stroke": "rgb(144, 144, 142)",
+        "radio_stroke": "rgb(153, 153, 153)",
+        "radio_stroke_pressed": "rgb(187, 187, 187)",
+        "radio_stroke_disabled": "rgb(187, 187, 187)",
+        "radio_fill": "rgba(0, 0, 0, 5)",
+        "radio_dot": "rgb(255, 255, 255)",
+        "radio_pressed_edge": "rgb(225, 224, 223)",
+        "radio_pressed_ring": "rgb(255, 224, 223)",
+        "radio_ring_disabled": "rgba(0, 0, 0, 0.2169)",
+        "radio_text_disabled": "rgba(0, 0, 0, 110)",
+    },
+    Theme.DARK: {
+        "text": "white",
+        "text_secondary": "rgba(255, 255, 255, 0.79)",
+        "text_tertiary": "rgb(206, 206, 206)",
+        "text_pressed": "rgba(255, 255, 255, 0.79)",
+        "text_disabled": "rgba(255, 255, 255, 0.36)",
+        "text_on_accent": "black",
+        "text_on_accent_pressed": "rgba(0, 0, 0, 0.5)",
+        "text_on_accent_disabled": "rgba(255, 255, 255, 0.53)",
+        "accent_disabled": "rgb(67, 67, 67)",
+        "background": "rgb(32, 32, 32)",
+        "surface": "rgb(43, 43, 43)",
+        "divider": "rgb(29, 29, 29)",
+        "stroke_subtle": "rgba(255, 255, 255, 0.06)",
+        "control_fill": "rgba(255, 255, 255, 0.06)",
+        "control_fill_hover": "rgba(255, 255, 255, 0.08)",
+        "control_fill_pressed": "rgba(255, 255, 255, 0.03)",
+        "control_fill_disabled": "rgba(255, 255, 255, 0.04)",
+        "control_stroke": "rgba(255, 255, 255, 0.07)",
+        "control_stroke_bottom": "rgba(255, 255, 255, 0.09)",
+        "subtle_fill_hover": "rgba(255, 255, 255, 15)",
+        "subtle_fill_pressed": "rgba(255, 255, 255, 10)",
+        "subtle_fill_selected": "rgba(255, 255, 255, 12)",
+        "subtle_fill_selected_active": "rgba(255, 255, 255, 0.06)",
+        "input_stroke": "rgba(255, 255, 255, 13)",
+        "input_stroke_bottom": "rgba(255, 255, 255, 140)",
+        "input_text_disabled": "rgba(255, 255, 255, 93)",
+        "flyout_background": "rgb(44, 44, 44)",
+        "flyout_stroke": "rgba(0, 0, 0, 0.2)",
+        "dialog_stroke": "rgb(58, 58, 58)",
+        "radio_stroke": "rgb(154, 154, 154)",
+        "radio_stroke_pressed": "rgb(110, 110, 110)",
+        "radio_stroke_disabled": "rgb(90, 90, 90)",
+        "radio_fill": "rgba(0, 0, 0, 26)",
+        "radio_dot": "rgb(0, 0, 0)",
+        "radio_pressed_edge": "rgb(60, 60, 60)",
+        "radio_pressed_ring": "rgb(60, 60, 60)",
+        "radio_ring_disabled": "rgba(255, 255, 255, 0.16)",
+        "radio_text_disabled": "rgba(255, 255, 255, 93)",
+    },
+}
+
+_theme = Theme.LIGHT
+
+# 解码后的QSS模板，key为path
+_qss_cache = {}  # type: dict[str, str]
+# 代入当前主题变量后的QSS，key为path，主题或强调色变化时清空
+_compiled_cache = {}  # type: dict[str, str]
+# 单独设置了QSS的控件，切换主题时统一重新设置
+_widgets = WeakKeyDictionary()  # type: WeakKeyDictionary[QWidget, StyleSheet]
+# 为True时所有QSS已合并安装到QApplication上，控件不再单独调用setStyleSheet
+_app_style_installed = False
+# 调用install_styles之前QApplication已有的样式表
+_app_base_style_sheet = ""
+
+_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+_RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_VARIABLE_PATTERN = re.compile(r"@(\w+)")
+
+
+def get_theme() -> Theme:
+    return _theme
+
+
+def set_theme(theme: Theme) -> None:
+    global _theme
+
+    if theme == _theme:
+        return
+
+    _theme = theme
+    refresh_style_sheets()
+
+
+def clear_style_sheet_cache() -> None:
+    """清空QSS缓存，QSS资源发生变化后需要调用"""
+
+    _qss_cache.clear()
+    _compiled_cache.clear()
+
+
+def refresh_style_sheets() -> None:
+    """主题或强调色变化后重新生成QSS并应用
+
+    每份QSS只编译一次，再统一设置到应用或已注册的控件上
+
+    """
+
+    _compiled_cache.clear()
+
+    if _app_style_installed:
+        app = QApplication.instance()
+        if app is not None:
+            app.setStyleSheet(_app_style_sheet())
+        return
+
+    # C++对象已被删除而Python对象还未回收的控件直接跳过
+    for widget, style_sheet in list(_widgets.items()):
+        if shiboken6.isValid(widget):
+            widget.setStyleSheet(style_sheet.qss())
+
+
+def install_styles(app: QApplication) -> None:
+    """把所有FStyleSheet合并为一份应用级样式表
+
+    之后创建的控件不再单独调用setStyleSheet，避免每个控件都生成一份样式并重新polish，
+    控件数量较多时可显著缩短构造时间
+
+    """
+
+    global _app_style_installed, _app_base_style_sheet
+
+    if _app_style_installed:
+        return
+
+    _app_base_style_sheet = app.styleSheet()
+    app.setStyleSheet(_app_style_sheet())
+
+    _app_style_installed = True
+
+    # 已经单独设置过QSS的控件改为使用应用级样式表
+    for widget in list(_widgets.keys()):
+        if shiboken6.isValid(widget):
+            widget.setStyleSheet("")
+    _widgets.clear()
+
+
+def _app_style_sheet() -> str:
+    # GROUP_BOX等尚未提供QSS资源的样式跳过
+    qss = "\n".join(
+        style_sheet.scoped_qss()
+        for style_sheet in FStyleSheet
+        if QFile.exists(style_sheet.path())
+    )
+
+    return "\n".join(filter(None, [_app_base_style_sheet, qss]))
+
+
+def _theme_variables() -> dict[str, str]:
+    variables = dict(_THEME_VARIABLES[_theme])
+    for theme_color in ThemeColor:
+        r, g, b, _ = theme_color.color().getRgb()
+        variables[theme_color.value] = f"rgb({r}, {g}, {b})"
+
+    return variables
 
 
 class StyleSheet:
     def apply(self, widget: QWidget) -> None:
-        style_sheet = self.read_qss()
-        widget.setStyleSheet(style_sheet)
+        if _app_style_installed:
+            return
+
+        widget.setStyleSheet(self.qss())
+        _widgets[widget] = self
+
+    def scope(self) -> tuple[str, ...]:
+        """QSS所属控件的类名
+
+        合并为应用级样式表时，没有以这些类名开头的选择器会被限定在这些控件内，
+        以保持与单独setStyleSheet时相同的作用范围
+
+        """
+
+        return ()
+
+    def scoped_qss(self) -> str:
+        qss = _COMMENT_PATTERN.sub("", self.qss())
+        scope = self.scope()
+        if not scope:
+            return qss
+
+        rules = []
+        for match in _RULE_PATTERN.finditer(qss):
+            selectors = []
+            for selector in match.group(1).split(","):
+                selector = selector.strip()
+                if selector.startswith(scope):
+                    selectors.append(selector)
+                else:
+                    selectors.extend(f"{owner} {selector}" for owner in scope)
+            rules.append(f"{', '.join(selectors)} {{{match.group(2)}}}")
+
+        return "\n\n".join(rules)
 
     def path(self) -> str:
         raise NotImplementedError
 
+    def qss(self) -> str:
+        """代入当前主题变量后的QSS"""
+
+        qss = _compiled_cache.get(self.path())
+        if qss is not None:
+            return qss
+
+        variables = _theme_variables()
+        qss = _VARIABLE_PATTERN.sub(
+            lambda match: variables.get(match.group(1), match.group(0)),
+            self.read_qss(),
+        )
+
+        _compiled_cache[self.path()] = qss
+        return qss
+
     def read_qss(self) -> str:
+        qss = _qss_cache.get(self.path())
+        if qss is not None:
+            return qss
+
         file = QFile(self.path())
         file.open(QFile.ReadOnly)
         qss = str(file.readAll(), encoding="utf-8")
         file.close()
+
+        _qss_cache[self.path()] = qss
         return qss
 
 
@@ -35,3 +288,11 @@ class FStyleSheet(StyleSheet, Enum):
 
     def path(self) -> str:
         return f":/fluentui/qss/{self.value}.qss"
+
+    def scope(self) -> tuple[str, ...]:
+        if self == self.DIALOG:
+            return ("FMessageBox",)
+        elif self == self.WINDOW:
+            return ("FMainWindow", "FWidget")
+        else:
+            return ()
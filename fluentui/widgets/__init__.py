@@ -1,30 +1,56 @@
-from .button import FPushButton, PrimaryPushButton
-from .dialog import FDialog, FMessageBox
-from .line_edit import FLineEdit, FPlainTextEdit, FTextEdit
-from .list_view import FListWidget
-from .menu import FMenu, MenuAnimationType
-from .navigation import (
-    NavigationInterface,
-    NavigationPanel,
-    NavigationPushButton,
-    NavigationSeparator,
-    NavigationToolButton,
-    NavigationWidget,
-    PanelPosition,
-)
-from .progress_bar import FProgressBar, IndeterminateProgressBar
-from .radio_button import FRadioButton
-from .scroll_bar import FScrollBar, FSmoothScrollBar
-from .setting_card import (
-    PushSettingCard,
-    SettingCard,
-    SettingCardGroup,
-    SliderSettingCard,
-    SwitchSettingCard,
-)
-from .slider import FSlider
-from .switch_button import FSwitchButton, IndicatorPosition
-from .tool_bar import FToolBar
-from .tool_tip import FToolTip, FToolTipFilter, ToolTipPosition
-from .widget import FWidget
-from .window import FMainWindow
+from importlib import import_module
+
+# 控件在首次访问时才导入对应模块，只使用部分控件时不必加载全部控件
+_WIDGETS = {
+    "FPushButton": "button",
+    "PrimaryPushButton": "button",
+    "FDialog": "dialog",
+    "FMessageBox": "dialog",
+    "FLineEdit": "line_edit",
+    "FPlainTextEdit": "line_edit",
+    "FTextEdit": "line_edit",
+    "FListWidget": "list_view",
+    "FMenu": "menu",
+    "MenuAnimationType": "menu",
+    "NavigationInterface": "navigation",
+    "NavigationPanel": "navigation",
+    "NavigationPushButton": "navigation",
+    "NavigationSeparator": "navigation",
+    "NavigationToolButton": "navigation",
+    "NavigationWidget": "navigation",
+    "PanelPosition": "navigation",
+    "FProgressBar": "progress_bar",
+    "IndeterminateProgressBar": "progress_bar",
+    "FRadioButton": "radio_button",
+    "FScrollBar": "scroll_bar",
+    "FSmoothScrollBar": "scroll_bar",
+    "PushSettingCard": "setting_card",
+    "SettingCard": "setting_card",
+    "SettingCardGroup": "setting_card",
+    "SliderSettingCard": "setting_card",
+    "SwitchSettingCard": "setting_card",
+    "FSlider": "slider",
+    "FSwitchButton": "switch_button",
+    "IndicatorPosition": "switch_button",
+    "FToolBar": "tool_bar",
+    "FToolTip": "tool_tip",
+    "FToolTipFilter": "tool_tip",
+    "ToolTipPosition": "tool_tip",
+    "FWidget": "widget",
+    "FMainWindow": "window",
+}
+
+__all__ = list(_WIDGETS)
+
+
+def __getattr__(name: str):
+    if name not in _WIDGETS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{_WIDGETS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
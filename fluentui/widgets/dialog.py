@@ -1,7 +1,6 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QPainter, QPaintEvent
 from PySide6.QtWidgets import (
-    QGraphicsDropShadowEffect,
     QGridLayout,
     QHBoxLayout,
     QLabel,
@@ -10,7 +9,15 @@ from PySide6.QtWidgets import (
 )
 
 from ..framesless import FramelessDialog
-from ..utils import FIcon, FluentColor, FStyleSheet, Icon, draw_icon, set_font
+from ..utils import (
+    FIcon,
+    FluentColor,
+    FShadowEffect,
+    FStyleSheet,
+    Icon,
+    draw_icon,
+    set_font,
+)
 from ..widgets import FPushButton, PrimaryPushButton
 
 
@@ -97,12 +104,11 @@ class FMessageBox(FramelessDialog):
         # TODO: 系统音效和闪烁效果
 
     def _set_shadow_effect(self) -> None:
-        shadow_effect = QGraphicsDropShadowEffect(self.widget)
-        shadow_effect.setBlurRadius(60)
-        shadow_effect.setOffset(0, 10)
-        shadow_effect.setColor(QColor(0, 0, 0, 50))
-        self.widget.setGraphicsEffect(None)
-        self.widget.setGraphicsEffect(shadow_effect)
+        self.shadow_effect = FShadowEffect(self.widget)
+        self.shadow_effect.setBlurRadius(60)
+        self.shadow_effect.setOffset(0, 10)
+        self.shadow_effect.setColor(QColor(0, 0, 0, 50))
+        self.shadow_effect.setBorderRadius(8)
 
     def _init_content(self) -> None:
         self.widget_contents.setObjectName("widget_contents")
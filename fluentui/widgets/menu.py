@@ -2,6 +2,7 @@ from enum import Enum
 
 from PySide6.QtCore import (
     QEasingCurve,
+    QEvent,
     QModelIndex,
     QObject,
     QPersistentModelIndex,
@@ -13,16 +14,17 @@ from PySide6.QtCore import (
 )
 from PySide6.QtGui import (
     QColor,
-    QFontMetrics,
+    QHideEvent,
     QIcon,
+    QKeyEvent,
     QKeySequence,
     QPainter,
     QPen,
     QPixmap,
     QRegion,
+    QShowEvent,
 )
 from PySide6.QtWidgets import (
-    QGraphicsDropShadowEffect,
     QHBoxLayout,
     QListWidget,
     QListWidgetItem,
@@ -31,7 +33,17 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..utils import FAction, FStyleSheet, get_screen_geometry, set_font
+from ..utils import (
+    FAction,
+    FShadowEffect,
+    FStyleSheet,
+    Theme,
+    font_metrics,
+    get_screen_geometry,
+    get_theme,
+    set_font,
+)
+from .scroll_bar import FSmoothScrollBar
 
 
 class MenuAnimationType(Enum):
@@ -42,6 +54,12 @@ class MenuAnimationType(Enum):
     FADE_IN_DROP_UP = 4
 
 
+def _theme_color(alpha: int) -> QColor:
+    # 分隔线和快捷键文字：浅色主题下为半透明黑色，深色主题下为半透明白色
+    value = 255 if get_theme() == Theme.DARK else 0
+    return QColor(value, value, value, alpha)
+
+
 class MenuItemDelegate(QStyledItemDelegate):
     @staticmethod
     def _is_seperator(index: QModelIndex | QPersistentModelIndex):
@@ -60,7 +78,7 @@ class MenuItemDelegate(QStyledItemDelegate):
 
         painter.save()
 
-        pen = QPen(QColor(0, 0, 0, 25), 1)
+        pen = QPen(_theme_color(25), 1)
         pen.setCosmetic(True)
         painter.setPen(pen)
         rect = option.rect
@@ -91,9 +109,9 @@ class ShortcutMenuItemDelegate(MenuItemDelegate):
 
         font = self.parent().font()
         painter.setFont(font)
-        painter.setPen(QColor(0, 0, 0, 153))
+        painter.setPen(_theme_color(153))
 
-        fm = QFontMetrics(font)
+        fm = font_metrics(font)
         shortcut = action.shortcut().toString(QKeySequence.SequenceFormat.NativeText)
 
         sw = fm.boundingRect(shortcut).width() + 1  # +1是为了修正字被遮住了一点儿
@@ -126,40 +144,120 @@ class MenuActionListWidget(QListWidget):
 
         self.setItemDelegate(ShortcutMenuItemDelegate(self))
 
+        # 限制高度后才创建滚动条
+        self.scroll_bar_v = None  # type: FSmoothScrollBar | None
+        self._max_height = 0
+
         FStyleSheet.MENU.apply(self)
         set_font(self, font_size=9)
 
-    def addItem(self, item: QListWidgetItem) -> None:
-        super().addItem(item)
-        self.adjustSize()
+    def maxVisibleHeight(self) -> int:
+        return self._max_height
 
-    def insertItem(self, row: int, item: QListWidgetItem) -> None:
-        super().insertItem(row, item)
-        self.adjustSize()
+    def setMaxVisibleHeight(self, height: int) -> None:
+        """限制最大高度，超出部分用FSmoothScrollBar滚动，0表示不限制"""
 
-    def takeItem(self, row: int) -> QListWidgetItem:
-        item = super().takeItem(row)
-        self.adjustSize()
+        self._max_height = max(0, height)
+        if self._max_height == 0 or self.scroll_bar_v is not None:
+            return
 
-        return item
+        # 按像素滚动，分批布局，只绘制可见的行
+        self.verticalScrollBar().setEnabled(True)
+        self.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
+        self.setLayoutMode(QListWidget.LayoutMode.Batched)
+        self.scroll_bar_v = FSmoothScrollBar(Qt.Orientation.Vertical, self)
 
     def adjustSize(self) -> None:
         size = QSize(1, 1)
         for i in range(self.count()):
-            s = self.item(i).sizeHint()
+            item = self.item(i)
+            if item.isHidden():
+                continue
+
+            s = item.sizeHint()
             size.setWidth(max(size.width(), s.width(), 1))
             size.setHeight(max(size.height() + s.height(), 1))
 
         # self.viewport().adjustSize()
 
+        self.resizeToContents(size)
+
+    def resizeToContents(self, size: QSize) -> None:
+        """按内容大小调整大小，size不含边距"""
+
         margins = self.viewportMargins()
-        size += QSize(
+        size = size + QSize(
             margins.left() + margins.right() + 2, margins.top() + margins.bottom()
         )
+        if self._max_height > 0:
+            size.setHeight(min(size.height(), self._max_height))
 
         self.setFixedSize(size)
 
 
+class MenuSearchIndex:
+    """菜单项文字的n-gram索引
+
+    记录文字中所有长度不超过N的子串对应的action，查询时取候选最少的子串，
+    再逐个校验是否包含查询文字，不区分大小写
+
+    """
+
+    N = 3
+
+    def __init__(self) -> None:
+        self._grams = {}  # type: dict[str, set[FAction]]
+        self._texts = {}  # type: dict[FAction, str]
+
+    def add(self, action: FAction) -> None:
+        text = action.text().casefold()
+        self._texts[action] = text
+        for gram in self._ngrams(text):
+            self._grams.setdefault(gram, set()).add(action)
+
+    def remove(self, action: FAction) -> None:
+        text = self._texts.pop(action, None)
+        if text is None:
+            return
+
+        for gram in self._ngrams(text):
+            actions = self._grams[gram]
+            actions.discard(action)
+            if not actions:
+                del self._grams[gram]
+
+    def update(self, action: FAction) -> None:
+        """action的文字修改后重新索引"""
+
+        if self._texts.get(action) != action.text().casefold():
+            self.remove(action)
+            self.add(action)
+
+    def matches(self, action: FAction, query: str) -> bool:
+        return query.casefold() in self._texts.get(action, "")
+
+    def search(self, query: str, candidates: set[FAction] = None) -> set[FAction]:
+        """返回文字包含query的action，candidates不为None时只在其中查找"""
+
+        query = query.casefold()
+        if candidates is None:
+            n = min(len(query), self.N)
+            grams = {query[i : i + n] for i in range(len(query) - n + 1)}
+            candidates = min((self._grams.get(g, set()) for g in grams), key=len)
+            # 不超过N的查询本身就是索引中的子串，无需校验
+            if len(query) <= self.N:
+                return set(candidates)
+
+        return {a for a in candidates if query in self._texts[a]}
+
+    def _ngrams(self, text: str) -> set[str]:
+        return {
+            text[i : i + n]
+            for n in range(1, self.N + 1)
+            for i in range(len(text) - n + 1)
+        }
+
+
 class FMenu(QWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(parent=parent)
@@ -182,24 +280,37 @@ class FMenu(QWidget):
         self.view = MenuActionListWidget(self)
         self.hlyt.addWidget(self.view, 1, Qt.AlignmentFlag.AlignCenter)
 
-        self.shadow_effect = QGraphicsDropShadowEffect(self.view)
+        self.shadow_effect = FShadowEffect(self.view)
         self.shadow_effect.setBlurRadius(30)
         self.shadow_effect.setOffset(0, 8)
         self.shadow_effect.setColor(QColor(0, 0, 0, 30))
-        self.view.setGraphicsEffect(self.shadow_effect)
+        self.shadow_effect.setBorderRadius(9)
 
         self._actions = []  # type: list[FAction]
+        self._items = {}  # type: dict[FAction, QListWidgetItem]
+        self._separators = []  # type: list[QListWidgetItem]
+
+        # 布局延迟到显示前统一计算，图标列和快捷键列对所有菜单项生效
+        self._layout_dirty = False
+        self._is_virtualized = False
+        self._has_icon = False
+        self._shortcut_width = 0
+        self._content_size = QSize(1, 1)
+
+        # 输入筛选，只有开启后才建立索引
+        self._search_index = None  # type: MenuSearchIndex | None
+        self._filter_text = ""
+        self._visible_actions = set()  # type: set[FAction]
 
         self._item_height = 28
 
         self.view.itemClicked.connect(self._on_item_clicked)
+        self.view.installEventFilter(self)
 
         self.ani_manager = None
 
         # TODO: 增加SubMenu功能，需要写的比较多
 
-        # TODO: 原代码对于是否要加icon的逻辑有问题，比如第一个没加，第二个相加怎么办
-
         # TODO: 增加菜单的弹出动画
 
         # TODO: 对面对于view、viewport和margins的概念比较迷糊，比如在代码中有如下情况，
@@ -207,24 +318,98 @@ class FMenu(QWidget):
         #  self.view.contentsMargins()=(1, 1, 1, 1) 这个又影响什么就不清楚了
 
     def addAction(self, action: FAction) -> None:
-        item = self._create_action_item(action)
-        self.view.addItem(item)
-        self.adjustSize()
+        self.insertAction(None, action)
 
     def addActions(self, actions: list[FAction]) -> None:
+        # 显示中批量添加时也只重新布局一次
         for action in actions:
-            self.addAction(action)
+            self._insert_action(None, action)
+        self._invalidate_layout()
 
-    def addSeparator(self) -> None:
-        margins = self.view.viewportMargins()
-        width = self.view.width() - margins.left() - margins.right()
+    def insertAction(self, before: FAction | None, action: FAction) -> None:
+        """在before之前插入action，before为None或不在菜单中时添加到末尾"""
+
+        self._insert_action(before, action)
+        self._invalidate_layout()
 
-        item = QListWidgetItem(self.view)
+    def removeAction(self, action: FAction) -> None:
+        if self._remove_action(action):
+            self._invalidate_layout()
+
+    def isTypeAheadEnabled(self) -> bool:
+        return self._search_index is not None
+
+    def setTypeAheadEnabled(self, enabled: bool) -> None:
+        """开启后在菜单中输入文字，只显示包含该文字的菜单项"""
+
+        if enabled == self.isTypeAheadEnabled():
+            return
+
+        if enabled:
+            self._search_index = MenuSearchIndex()
+            for action in self._actions:
+                self._search_index.add(action)
+        else:
+            self.clearFilter()
+            self._search_index = None
+
+    def filterText(self) -> str:
+        return self._filter_text
+
+    def setFilterText(self, text: str) -> None:
+        """只显示文字包含text的菜单项，不区分大小写，text为空时显示全部"""
+
+        if self._search_index is None or text == self._filter_text:
+            return
+
+        previous = self._visible_actions if self._filter_text else set(self._items)
+        if not text:
+            visible = set(self._items)
+        elif self._filter_text and self._filter_text.casefold() in text.casefold():
+            # 输入变长时结果只会变少，在上一次的结果中继续筛选
+            visible = self._search_index.search(text, self._visible_actions)
+        else:
+            visible = self._search_index.search(text)
+
+        # 只修改显示状态有变化的行
+        for action in previous - visible:
+            self._items[action].setHidden(True)
+        for action in visible - previous:
+            self._items[action].setHidden(False)
+        if bool(text) != bool(self._filter_text):
+            for item in self._separators:
+                item.setHidden(bool(text))
+
+        self._filter_text = text
+        self._visible_actions = visible if text else set()
+
+        # 筛选后的高度依赖完成布局后的菜单项大小
+        if self._layout_dirty:
+            self._update_layout()
+        else:
+            self._resize_to_contents()
+        self._update_current_item()
+
+    def clearFilter(self) -> None:
+        self.setFilterText("")
+
+    def isVirtualized(self) -> bool:
+        return self._is_virtualized
+
+    def setVirtualized(self, enabled: bool) -> None:
+        """菜单高度不超过屏幕可用区域，超出部分滚动显示，适合成百上千项的菜单"""
+
+        self._is_virtualized = enabled
+        self._invalidate_layout()
+
+    def addSeparator(self) -> None:
+        item = QListWidgetItem()
         item.setFlags(Qt.ItemFlag.NoItemFlags)  # 加了就不可以被选中了
-        item.setSizeHint(QSize(width, 9))
-        self.view.addItem(item)
         item.setData(Qt.ItemDataRole.DecorationRole, "seperator")
-        self.adjustSize()
+        self.view.addItem(item)
+        item.setHidden(bool(self._filter_text))
+        self._separators.append(item)
+        self._invalidate_layout()
 
     def adjustSize(self) -> None:
         margins = self.layout().contentsMargins()
@@ -233,52 +418,197 @@ class FMenu(QWidget):
         self.setFixedSize(width, height)
 
     def exec(self, pos: QPoint, ani_type=MenuAnimationType.NONE) -> None:
+        # 弹出位置依赖菜单大小，需要先完成布局
+        self._update_layout()
+
         self.ani_manager = MenuAnimationManager.make(self, ani_type)
         self.ani_manager.exec(pos)
 
         self.show()
 
-    def _create_action_item(self, action: FAction) -> QListWidgetItem:
-        self._actions.append(action)
+    def showEvent(self, event: QShowEvent) -> None:
+        self._update_layout()
+        super().showEvent(event)
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super().hideEvent(event)
+        self.clearFilter()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        if not self._type_ahead(event):
+            super().keyPressEvent(event)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        # 列表获得焦点时，按键先交给它处理
+        if watched is self.view and event.type() == QEvent.Type.KeyPress:
+            return self._type_ahead(event)
+
+        return super().eventFilter(watched, event)
+
+    def _type_ahead(self, event: QKeyEvent) -> bool:
+        if self._search_index is None:
+            return False
+
+        key, text = event.key(), event.text()
+        if key == Qt.Key.Key_Backspace and self._filter_text:
+            self.setFilterText(self._filter_text[:-1])
+        elif key == Qt.Key.Key_Escape and self._filter_text:
+            self.clearFilter()
+        elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            item = self.view.currentItem()
+            if item is not None and not item.isHidden():
+                self._on_item_clicked(item)
+        elif text and text.isprintable() and not self._has_command_modifier(event):
+            self.setFilterText(self._filter_text + text)
+        else:
+            return False
+
+        return True
+
+    @staticmethod
+    def _has_command_modifier(event: QKeyEvent) -> bool:
+        modifiers = (
+            Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.AltModifier
+        )
+        return bool(event.modifiers() & modifiers)
+
+    def _update_current_item(self) -> None:
+        item = self.view.currentItem()
+        if item is not None and not item.isHidden():
+            return
+
+        actions = self._visible_actions if self._filter_text else self._actions
+        rows = [self.view.row(self._items[a]) for a in actions]
+        if rows:
+            self.view.setCurrentRow(min(rows))
+
+    def _insert_action(self, before: FAction | None, action: FAction) -> None:
+        if action in self._items:
+            self._remove_action(action)
+
+        item = self._create_action_item(action)
+        row = self._action_row(before)
+        if row < 0:
+            self._actions.append(action)
+            self.view.addItem(item)
+        else:
+            self._actions.insert(self._actions.index(before), action)
+            self.view.insertItem(row, item)
+        self._items[action] = item
 
-        icon = self._create_item_icon(action)
-        item = QListWidgetItem(icon, action.text())
+        if self._search_index is not None:
+            self._search_index.add(action)
 
-        self._adjust_item_text(item, action)
+        # 筛选中插入的菜单项同样需要筛选
+        if self._filter_text:
+            if self._search_index.matches(action, self._filter_text):
+                self._visible_actions.add(action)
+            else:
+                item.setHidden(True)
+
+    def _remove_action(self, action: FAction) -> bool:
+        row = self._action_row(action)
+        if row < 0:
+            return False
+
+        self._actions.remove(action)
+        del self._items[action]
+        self._visible_actions.discard(action)
+        if self._search_index is not None:
+            self._search_index.remove(action)
+
+        self.view.takeItem(row)
+        return True
+
+    def _invalidate_layout(self) -> None:
+        """未显示时延迟到显示前布局，显示中则立即重新布局"""
+
+        self._layout_dirty = True
+        if self.isVisible():
+            self._update_layout()
+
+    def _update_layout(self) -> None:
+        """统一计算图标列、快捷键列和各菜单项的大小"""
+
+        if not self._layout_dirty:
+            return
+
+        self._has_icon = any(a.icon() is not None for a in self._actions)
+        self._shortcut_width = max(
+            map(self._shortcut_text_width, self._actions), default=0
+        )
+
+        # 有图标时，没有图标的菜单项用同一个透明图标占位
+        placeholder = QIcon()
+        if self._has_icon:
+            pixmap = QPixmap(self.view.iconSize())
+            pixmap.fill(Qt.GlobalColor.transparent)
+            placeholder = QIcon(pixmap)
+
+        width = 1
+        for action, item in self._items.items():
+            item.setIcon(self._create_item_icon(action, placeholder))
+            width = max(width, self._adjust_item_text(item, action))
+            if self._search_index is not None:
+                self._search_index.update(action)
+
+        for item in self._separators:
+            item.setSizeHint(QSize(width, 9))
+
+        height = len(self._items) * self._item_height + len(self._separators) * 9
+        self._content_size = QSize(width, height + 1)
+
+        max_height = 0
+        if self._is_virtualized:
+            margins = self.layout().contentsMargins()
+            height = get_screen_geometry().height()
+            max_height = height - margins.top() - margins.bottom()
+        self.view.setMaxVisibleHeight(max_height)
+
+        self._resize_to_contents()
+        self._layout_dirty = False
+
+    def _resize_to_contents(self) -> None:
+        # 筛选时分隔线都被隐藏，只需按可见菜单项的数量计算高度
+        size = QSize(self._content_size)
+        if self._filter_text:
+            size.setHeight(len(self._visible_actions) * self._item_height + 1)
+
+        self.view.resizeToContents(size)
+        self.adjustSize()
+
+    def _action_row(self, action: FAction | None) -> int:
+        if action not in self._items:
+            return -1
+
+        return self.view.row(self._items[action])
 
+    def _create_action_item(self, action: FAction) -> QListWidgetItem:
+        # 图标和大小在_update_layout中设置
+        item = QListWidgetItem(action.text())
         item.setData(Qt.ItemDataRole.UserRole, action)
 
         return item
 
     def _has_item_icon(self) -> bool:
-        return any(a.icon() is not None for a in self._actions)
-
-    def _create_item_icon(self, action: FAction) -> QIcon:
-        # 如果前面的action中有icon了，那么即使这个action没有也要给一个透明的
-        # 如果前面都没有icon，那就给个空的
-        # 但感觉有一点不合理，万一第一个没有，第二个又有了，此时第一个已经没法修改了
-        if self._has_item_icon():
-            if action.icon() is None:
-                pixmap = QPixmap(self.view.iconSize())
-                pixmap.fill(Qt.GlobalColor.transparent)
-                icon = QIcon(pixmap)
-            else:
-                icon = action.icon().icon()
-        else:
-            icon = QIcon()
+        return self._has_icon
 
-        return icon
+    def _create_item_icon(self, action: FAction, placeholder: QIcon) -> QIcon:
+        # 只要有一个action有icon，其余没有icon的action也要给一个透明的占位
+        if action.icon() is None:
+            return placeholder
 
-    def _longest_shortcut_width(self) -> int:
-        longest_width = 0
-        for action in self._actions:
-            shortcut = action.shortcut().toString(
-                QKeySequence.SequenceFormat.NativeText
-            )
-            width = self.view.fontMetrics().boundingRect(shortcut).width()
-            longest_width = max(longest_width, width)
+        return action.icon().icon()
+
+    def _shortcut_text_width(self, action: FAction) -> int:
+        if action.shortcut().isEmpty():
+            return 0
 
-        return longest_width
+        shortcut = action.shortcut().toString(QKeySequence.SequenceFormat.NativeText)
+        return font_metrics(self.view.font()).boundingRect(shortcut).width()
+
+    def _longest_shortcut_width(self) -> int:
+        return self._shortcut_width
 
     def _adjust_item_text(self, item: QListWidgetItem, action: FAction) -> int:
         # TODO: leave sine space for shortcut key
@@ -287,7 +617,7 @@ class FMenu(QWidget):
         sw = sw + 22 if sw != 0 else 0
 
         text = action.text()
-        fm = self.view.fontMetrics()
+        fm = font_metrics(self.view.font())
         if not self._has_item_icon():
             item.setText(text)
             width = 40 + fm.boundingRect(text).width() + sw
@@ -302,7 +632,7 @@ class FMenu(QWidget):
 
     def _on_item_clicked(self, item: QListWidgetItem) -> None:
         action: FAction = item.data(Qt.ItemDataRole.UserRole)
-        if action not in self._actions or not action.isEnabled():
+        if action not in self._items or not action.isEnabled():
             return
 
         self.view.clearSelection()
@@ -163,7 +163,7 @@ class NavigationPanel(QWidget):
         self._set_widgets_expanded(True)
 
         self.setProperty("expand", True)
-        self.setStyleSheet(self.styleSheet())
+        self._repolish()
 
         # panel的父类必须设置为窗口，否则会被其他控件覆盖
         if not self.parent().isWindow():
@@ -198,7 +198,7 @@ class NavigationPanel(QWidget):
     def on_animation_finished(self):
         if self._state == PanelState.COLLAPSED:
             self.setProperty("expand", False)
-            self.setStyleSheet(self.styleSheet())
+            self._repolish()
 
             if self._hide:
                 self.hide()
@@ -206,6 +206,12 @@ class NavigationPanel(QWidget):
     def setMenuButtonVisible(self, is_visible: bool) -> None:
         self.btn_menu.setVisible(is_visible)
 
+    def _repolish(self) -> None:
+        # 属性变化后需要重新polish才能匹配到新的QSS
+        # 不能用setStyleSheet(self.styleSheet())，样式安装到QApplication上时控件自身的QSS为空
+        self.style().unpolish(self)
+        self.style().polish(self)
+
     def _set_widgets_expanded(self, is_expanded: bool) -> None:
         for widget in self.findChildren(NavigationWidget):
             widget.setExpanded(is_expanded)
@@ -1,16 +1,20 @@
+import math
 from enum import Enum
+from functools import partial
+from typing import Callable
 
 from PySide6.QtCore import (
     Property,
     QEasingCurve,
     QEvent,
     QObject,
+    QPoint,
     QPointF,
     QPropertyAnimation,
+    QRect,
     QRectF,
     QSize,
     Qt,
-    QTimer,
     Signal,
 )
 from PySide6.QtGui import (
@@ -24,14 +28,14 @@ from PySide6.QtGui import (
 )
 from PySide6.QtWidgets import (
     QAbstractScrollArea,
-    QGraphicsOpacityEffect,
     QHBoxLayout,
     QToolButton,
     QVBoxLayout,
     QWidget,
 )
+from shiboken6 import isValid
 
-from ..utils import FIcon, draw_icon
+from ..utils import FIcon, draw_icon, get_frame_clock
 
 
 class ArrowButton(QToolButton):
@@ -42,8 +46,13 @@ class ArrowButton(QToolButton):
         self._icon = icon
 
     def paintEvent(self, event: QPaintEvent) -> None:
+        opacity = self.parent().opacity()
+        if opacity <= 0:
+            return
+
         painter = QPainter(self)
         painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        painter.setOpacity(opacity)
 
         s = 7 if self.isDown() else 8
         x = (self.width() - s) / 2
@@ -51,6 +60,8 @@ class ArrowButton(QToolButton):
 
 
 class ScrollBarGroove(QWidget):
+    opacityChanged = Signal(float)
+
     def __init__(self, orientation: Qt.Orientation, parent=None) -> None:
         super().__init__(parent=parent)
 
@@ -73,24 +84,33 @@ class ScrollBarGroove(QWidget):
             self.btn_down = ArrowButton(FIcon.CARET_RIGHT_FILLED, self)
             self.lyt.addWidget(self.btn_down, 0, Qt.AlignmentFlag.AlignVCenter)
 
-        self.opacity_effect = QGraphicsOpacityEffect(self)
-        self.opacity_effect.setOpacity(0)
-        self.setGraphicsEffect(self.opacity_effect)
+        # 用painter的透明度代替QGraphicsOpacityEffect，后者会导致离屏渲染
+        self._opacity = 0.0
+
+    def opacity(self) -> float:
+        return self._opacity
+
+    def setOpacity(self, opacity: float) -> None:
+        if opacity == self._opacity:
+            return
 
-        self.animation = QPropertyAnimation(self.opacity_effect, b"opacity", self)
-        self.animation.setDuration(150)
+        self._opacity = opacity
+        self.update()
+        self.opacityChanged.emit(opacity)
 
     def fadeIn(self) -> None:
-        self.animation.setEndValue(1)
-        self.animation.start()
+        get_scroll_bar_controller().fade(self, 1)
 
     def fadeOut(self) -> None:
-        self.animation.setEndValue(0)
-        self.animation.start()
+        get_scroll_bar_controller().fade(self, 0)
 
     def paintEvent(self, event: QPaintEvent) -> None:
+        if self._opacity <= 0:
+            return
+
         painter = QPainter(self)
         painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        painter.setOpacity(self._opacity)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(QColor(252, 252, 252, 217))
         painter.drawRoundedRect(self.rect(), 6, 6)
@@ -119,6 +139,86 @@ class ScrollBarHandle(QWidget):
         painter.drawRoundedRect(self.rect(), r, r)
 
 
+class ScrollBarController:
+    """所有scroll bar共用的动画控制器
+
+    groove的淡入淡出和进入/离开后的延时展开/收起都由同一个FrameClock驱动，
+    不再为每个scroll bar创建QTimer、QGraphicsOpacityEffect和QPropertyAnimation
+
+    """
+
+    FADE_DURATION = 0.15
+
+    def __init__(self) -> None:
+        self._fades = {}  # type: dict[ScrollBarGroove, float]
+        self._delays = {}  # type: dict[FScrollBar, tuple[float, Callable[[], None]]]
+        self._time = 0.0
+        self._is_active = False
+
+    def fade(self, groove: ScrollBarGroove, opacity: float) -> None:
+        if groove.opacity() == opacity:
+            self._fades.pop(groove, None)
+            return
+
+        self._fades[groove] = opacity
+        self._start()
+
+    def delay(
+        self, scroll_bar: "FScrollBar", msec: int, callback: Callable[[], None]
+    ) -> None:
+        """msec毫秒后调用callback，同一个scroll bar之前未执行的回调会被取消"""
+
+        self._delays[scroll_bar] = (self._time + msec / 1000, callback)
+        self._start()
+
+    def _start(self) -> None:
+        if not self._is_active:
+            self._is_active = True
+            get_frame_clock().subscribe(self._on_frame)
+
+    def _on_frame(self, dt: float) -> None:
+        self._time += dt
+
+        for scroll_bar, (deadline, callback) in list(self._delays.items()):
+            if not isValid(scroll_bar):
+                del self._delays[scroll_bar]
+            elif deadline <= self._time:
+                del self._delays[scroll_bar]
+                callback()
+
+        step = dt / self.FADE_DURATION
+        for groove, target in list(self._fades.items()):
+            if not isValid(groove):
+                del self._fades[groove]
+                continue
+
+            opacity = groove.opacity()
+            if opacity < target:
+                opacity = min(opacity + step, target)
+            else:
+                opacity = max(opacity - step, target)
+            if opacity == target:
+                del self._fades[groove]
+
+            groove.setOpacity(opacity)
+
+        if not self._fades and not self._delays:
+            self._is_active = False
+            get_frame_clock().unsubscribe(self._on_frame)
+
+
+_scroll_bar_controller = None  # type: ScrollBarController | None
+
+
+def get_scroll_bar_controller() -> ScrollBarController:
+    global _scroll_bar_controller
+
+    if _scroll_bar_controller is None:
+        _scroll_bar_controller = ScrollBarController()
+
+    return _scroll_bar_controller
+
+
 class ScrollBarRegion(Enum):
     GROOVE_UP = 0
     EMPTY_SLIDER_UP = 1
@@ -131,6 +231,12 @@ class FScrollBar(QWidget):
     rangeChanged = Signal(tuple)
     valueChanged = Signal(int)
 
+    # 按住箭头时先翻一页，延时后随帧连续滚动，速度（页/秒）随按住时间线性增加
+    REPEAT_DELAY = 0.3
+    REPEAT_SPEED = 5
+    REPEAT_ACCELERATION = 30
+    REPEAT_MAX_SPEED = 200
+
     def __init__(
         self, orientation: Qt.Orientation, parent: QAbstractScrollArea
     ) -> None:
@@ -138,7 +244,6 @@ class FScrollBar(QWidget):
 
         self.groove = ScrollBarGroove(orientation, self)
         self.handle = ScrollBarHandle(orientation, self)
-        self.timer = QTimer(self)
 
         self._orientation = orientation
         self._single_step = 1
@@ -152,7 +257,19 @@ class FScrollBar(QWidget):
         self._is_entered = False
         self._is_expanded = False
         self._is_drag = False
-        self._drag_pos = None
+        # 拖拽开始时的鼠标位置和value，拖拽过程中的value都相对于它计算，避免累积误差
+        self._drag_anchor_pos = 0.0
+        self._drag_anchor_value = 0
+
+        # 为True时不再移动handle子控件，而是在paintEvent中绘制groove和handle
+        self._is_painted_handle = False
+        self._handle_geometry = QRect()
+        self._pressed_region = None  # type: ScrollBarRegion | None
+
+        # 按住箭头的方向（-1/1，0表示未按住）、已按住的时间和未满一个单位的滚动量
+        self._repeat_direction = 0
+        self._repeat_time = 0.0
+        self._repeat_remainder = 0.0
 
         if orientation == Qt.Orientation.Vertical:
             self.setFixedWidth(12)
@@ -163,11 +280,14 @@ class FScrollBar(QWidget):
             self.ori_bar = parent.horizontalScrollBar()
             parent.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
-        self.groove.btn_up.clicked.connect(self._on_page_up)
-        self.groove.btn_down.clicked.connect(self._on_page_down)
-        self.groove.animation.valueChanged.connect(
-            self._on_groove_animation_valueChanged
+        self.groove.btn_up.pressed.connect(partial(self._start_repeat, -1))
+        self.groove.btn_down.pressed.connect(partial(self._start_repeat, 1))
+        self.groove.btn_up.released.connect(self._stop_repeat)
+        self.groove.btn_down.released.connect(self._stop_repeat)
+        self.destroyed.connect(
+            partial(get_frame_clock().unsubscribe, self._on_repeat_frame)
         )
+        self.groove.opacityChanged.connect(self._on_groove_opacity_changed)
 
         self.ori_bar.rangeChanged.connect(self.setRange)
         self.ori_bar.valueChanged.connect(self.setValue)
@@ -241,6 +361,26 @@ class FScrollBar(QWidget):
         if step > 1:
             self._page_step = step
 
+    def isPaintedHandle(self) -> bool:
+        return self._is_painted_handle
+
+    def setPaintedHandle(self, enabled: bool) -> None:
+        """在自身的paintEvent中绘制groove和handle
+
+        滚动时只重绘handle移动前后覆盖的区域，不再产生子控件的move/resize事件
+
+        """
+
+        if enabled == self._is_painted_handle:
+            return
+
+        self._is_painted_handle = enabled
+        self.groove.setVisible(not enabled)
+        self.handle.setVisible(not enabled)
+
+        self._update_handle_geometry()
+        self.update()
+
     def expand(self) -> None:
         if self._is_expanded or not self._is_entered:
             return
@@ -257,13 +397,11 @@ class FScrollBar(QWidget):
 
     def enterEvent(self, event: QEnterEvent) -> None:
         self._is_entered = True
-        self.timer.stop()
-        self.timer.singleShot(200, self.expand)
+        get_scroll_bar_controller().delay(self, 200, self.expand)
 
     def leaveEvent(self, event: QEvent) -> None:
         self._is_entered = False
-        self.timer.stop()
-        self.timer.singleShot(200, self.collapse)
+        get_scroll_bar_controller().delay(self, 200, self.collapse)
 
     def eventFilter(self, watched: QObject, event: QEvent) -> bool:
         if watched is self.parent() and isinstance(event, QResizeEvent):
@@ -280,21 +418,8 @@ class FScrollBar(QWidget):
         if not self._is_drag:
             return
 
-        pos = event.position()
-        if self._orientation == Qt.Orientation.Vertical:
-            delta = pos.y() - self._drag_pos.y()
-        else:
-            delta = pos.x() - self._drag_pos.x()
-
-        delta = int(
-            delta
-            / max(self._slider_empty_length(), 1)
-            * (self._maximum - self._minimum)
-        )
-        if delta != 0:
-            self.setValue(self._value + delta)
-
-        self._drag_pos = pos
+        delta = self._axis_pos(event.position()) - self._drag_anchor_pos
+        self.setValue(self._drag_anchor_value + round(self._pixels_to_value(delta)))
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         super().mousePressEvent(event)
@@ -303,52 +428,118 @@ class FScrollBar(QWidget):
         region = self._get_region(pos)
         if region == ScrollBarRegion.HANDLE:  # 拖拽
             self._is_drag = True
-            self._drag_pos = pos
+            self._drag_anchor_pos = self._axis_pos(pos)
+            self._drag_anchor_value = self._value
             return
 
         if region in [
             ScrollBarRegion.GROOVE_UP,
             ScrollBarRegion.GROOVE_DOWN,
         ]:  # 点按钮
+            if self._is_painted_handle:
+                self._pressed_region = region
+                self.update(self._arrow_rect(region))
+                self._start_repeat(-1 if region == ScrollBarRegion.GROOVE_UP else 1)
             return
 
-        # if self._orientation == Qt.Orientation.Vertical:
-        #     if region == ScrollBarRegion.EMPTY_SLIDER_UP:
-        #         value = pos.y() - self._padding
-        #     else:
-        #         value = pos.y() - self.handle.height() - self._padding
-        # else:
-        #     if region == ScrollBarRegion.EMPTY_SLIDER_UP:
-        #         value = pos.x() - self._padding
-        #     else:
-        #         value = pos.x() - self.handle.width() - self._padding
-        # value = int(value / max(self._slider_empty_length(), 1) * self._maximum)
-
+        # handle的中心移动到点击位置，handle只能在除去自身长度后的空白区域内移动
         if self._orientation == Qt.Orientation.Vertical:
-            value = pos.y() - self._padding
+            handle_length = self.handle.height()
         else:
-            value = pos.x() - self._padding
-        value = int(value / max(self._slider_length(), 1) * self._maximum)
+            handle_length = self.handle.width()
+        offset = self._axis_pos(pos) - self._padding - handle_length / 2
 
-        self.setValue(value)
+        self.setValue(self._minimum + round(self._pixels_to_value(offset)))
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
         self._is_drag = False
-        self._drag_pos = None
+
+        region, self._pressed_region = self._pressed_region, None
+        if region is not None:
+            self.update(self._arrow_rect(region))
+            self._stop_repeat()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        if not self._is_painted_handle:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        opacity = self.groove.opacity()
+        if opacity > 0:
+            painter.setOpacity(opacity)
+            painter.setBrush(QColor(252, 252, 252, 217))
+            painter.drawRoundedRect(self.rect(), 6, 6)
+
+            for region in [ScrollBarRegion.GROOVE_UP, ScrollBarRegion.GROOVE_DOWN]:
+                # 与ArrowButton的绘制一致
+                rect = QRectF(self._arrow_rect(region))
+                s = 7 if region == self._pressed_region else 8
+                icon_rect = QRectF(0, 0, s, s)
+                icon_rect.moveCenter(rect.center())
+                draw_icon(self._arrow_icon(region), painter, icon_rect, fill="#858789")
+
+            painter.setOpacity(1)
+
+        if self._handle_geometry.intersects(event.rect()):
+            rect = self._handle_geometry
+            if self._orientation == Qt.Orientation.Vertical:
+                r = rect.width() / 2
+            else:
+                r = rect.height() / 2
+            painter.setBrush(QColor(0, 0, 0, 114))
+            painter.drawRoundedRect(rect, r, r)
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         super().wheelEvent(event)
         self.parent().wheelEvent(event)
 
     def _on_page_up(self) -> None:
-        self.setValue(self._value - self._page_step)
+        self._scroll_step(-self._page_step)
 
     def _on_page_down(self) -> None:
-        self.setValue(self._value + self._page_step)
+        self._scroll_step(self._page_step)
+
+    def _scroll_step(self, dv: int) -> None:
+        """箭头翻页和按住连续滚动都通过此方法，子类可替换为平滑滚动"""
+
+        self.setValue(self._value + dv)
+
+    def _start_repeat(self, direction: int) -> None:
+        if direction < 0:
+            self._on_page_up()
+        else:
+            self._on_page_down()
+
+        self._repeat_direction = direction
+        self._repeat_time = 0.0
+        self._repeat_remainder = 0.0
+        get_frame_clock().subscribe(self._on_repeat_frame)
+
+    def _stop_repeat(self) -> None:
+        self._repeat_direction = 0
+        get_frame_clock().unsubscribe(self._on_repeat_frame)
+
+    def _on_repeat_frame(self, dt: float) -> None:
+        self._repeat_time += dt
+        held = self._repeat_time - self.REPEAT_DELAY
+        if held <= 0:
+            return
+
+        speed = min(
+            self.REPEAT_SPEED + self.REPEAT_ACCELERATION * held, self.REPEAT_MAX_SPEED
+        )
+        self._repeat_remainder += self._repeat_direction * speed * self._page_step * dt
+
+        dv = int(self._repeat_remainder)
+        if dv != 0:
+            self._repeat_remainder -= dv
+            self._scroll_step(dv)
 
-    def _on_groove_animation_valueChanged(self) -> None:
-        opacity = self.groove.opacity_effect.opacity()
+    def _on_groove_opacity_changed(self, opacity: float) -> None:
         width = int(3 + opacity * 3)
         if self._orientation == Qt.Orientation.Vertical:
             self.handle.setFixedWidth(width)
@@ -357,6 +548,23 @@ class FScrollBar(QWidget):
 
         self._adjust_handle_pos()
 
+        if self._is_painted_handle:
+            # 淡入淡出时groove整体变化
+            self.update()
+
+    def _axis_pos(self, pos: QPointF) -> float:
+        if self._orientation == Qt.Orientation.Vertical:
+            return pos.y()
+        else:
+            return pos.x()
+
+    def _pixels_to_value(self, pixels: float) -> float:
+        return (
+            pixels
+            / max(self._slider_empty_length(), 1)
+            * (self._maximum - self._minimum)
+        )
+
     def _slider_length(self) -> int:
         if self._orientation == Qt.Orientation.Vertical:
             return self.height() - 2 * self._padding
@@ -382,7 +590,7 @@ class FScrollBar(QWidget):
             self.move(1, size.height() - 13)
 
     def _adjust_handle_size(self) -> None:
-        slider_length = self._slider_length()
+        slider_length = max(self._slider_length(), 1)
         handle_length = int(
             slider_length / (1 + (self._maximum - self._minimum) / slider_length)
         )
@@ -392,16 +600,47 @@ class FScrollBar(QWidget):
             self.handle.setFixedWidth(max(30, handle_length))
 
     def _adjust_handle_pos(self) -> None:
-        ratio = self._value / max(self._maximum - self._minimum, 1)
+        ratio = (self._value - self._minimum) / max(self._maximum - self._minimum, 1)
         slider_empty_length = self._slider_empty_length()
         delta = int(ratio * slider_empty_length)
 
         if self._orientation == Qt.Orientation.Vertical:
             x = self.width() - self.handle.width() - 3
-            self.handle.move(x, self._padding + delta)
+            pos = QPoint(x, self._padding + delta)
         else:
             y = self.height() - self.handle.height() - 3
-            self.handle.move(self._padding + delta, y)
+            pos = QPoint(self._padding + delta, y)
+
+        # 绘制模式下handle子控件是隐藏的，move和resize不会产生事件和重绘，只用于记录几何信息
+        self.handle.move(pos)
+        self._update_handle_geometry()
+
+    def _update_handle_geometry(self) -> None:
+        old_geometry = self._handle_geometry
+        self._handle_geometry = self.handle.geometry()
+
+        if self._is_painted_handle and old_geometry != self._handle_geometry:
+            # 只重绘handle移动前后覆盖的区域
+            self.update(
+                old_geometry.united(self._handle_geometry).adjusted(-1, -1, 1, 1)
+            )
+
+    def _arrow_rect(self, region: ScrollBarRegion) -> QRect:
+        # 与ScrollBarGroove中的布局一致：按钮10x10，距两端3px，另一方向居中
+        if self._orientation == Qt.Orientation.Vertical:
+            x = (self.width() - 10) // 2
+            y = 3 if region == ScrollBarRegion.GROOVE_UP else self.height() - 13
+        else:
+            x = 3 if region == ScrollBarRegion.GROOVE_UP else self.width() - 13
+            y = (self.height() - 10) // 2
+
+        return QRect(x, y, 10, 10)
+
+    def _arrow_icon(self, region: ScrollBarRegion) -> FIcon:
+        if region == ScrollBarRegion.GROOVE_UP:
+            return self.groove.btn_up._icon
+        else:
+            return self.groove.btn_down._icon
 
     def _get_region(self, pos: QPointF) -> ScrollBarRegion:
         if self._orientation == Qt.Orientation.Vertical:
@@ -427,6 +666,88 @@ class FScrollBar(QWidget):
             return ScrollBarRegion.GROOVE_DOWN
 
 
+class KineticScroller(QObject):
+    """惯性滚动
+
+    滚轮的每一格转换为速度冲量，按摩擦力指数衰减，最终滚动的距离恰好等于各次滚动量之和；
+    触控板的像素增量由系统提供惯性，直接累加。两者都在FrameClock的每一帧中合并，
+    每帧最多设置一次value，并保留小数部分以免精细滚动被舍入丢失
+
+    """
+
+    # 速度衰减的时间常数（秒），越大惯性越强
+    FRICTION_TIME = 0.08
+    # 剩余距离小于此值时直接滚动到终点并停止
+    STOP_DISTANCE = 0.5
+
+    def __init__(self, scroll_bar: "FScrollBar") -> None:
+        super().__init__(parent=scroll_bar)
+
+        self._scroll_bar = scroll_bar
+        self._position = 0.0
+        self._velocity = 0.0
+        self._pending = 0.0
+        self._is_active = False
+
+        # 销毁时self已不可用，直接从FrameClock中移除回调；连接在自身上，
+        # 关闭惯性滚动后随自身销毁一起断开，不会一直持有已弃用的滚动器
+        self.destroyed.connect(partial(get_frame_clock().unsubscribe, self._on_frame))
+
+    def isActive(self) -> bool:
+        return self._is_active
+
+    def scrollBy(self, delta: float) -> None:
+        """滚轮增量，带惯性"""
+
+        self._velocity += delta / self.FRICTION_TIME
+        self._start()
+
+    def scrollByPixels(self, delta: float) -> None:
+        """触控板等高精度设备的增量，不额外附加惯性"""
+
+        self._pending += delta
+        self._start()
+
+    def stop(self) -> None:
+        self._velocity = 0.0
+        self._pending = 0.0
+        if self._is_active:
+            self._is_active = False
+            get_frame_clock().unsubscribe(self._on_frame)
+
+    def _start(self) -> None:
+        if self._is_active:
+            return
+
+        self._is_active = True
+        self._position = float(self._scroll_bar.value)
+        get_frame_clock().subscribe(self._on_frame)
+
+    def _on_frame(self, dt: float) -> None:
+        # value被拖拽等外部操作修改后，以新值为起点
+        if round(self._position) != self._scroll_bar.value:
+            self._position = float(self._scroll_bar.value)
+
+        decay = math.exp(-dt / self.FRICTION_TIME)
+        distance = self._pending + self._velocity * self.FRICTION_TIME * (1 - decay)
+        self._velocity *= decay
+        self._pending = 0.0
+
+        if abs(self._velocity * self.FRICTION_TIME) < self.STOP_DISTANCE:
+            distance += self._velocity * self.FRICTION_TIME
+            self._velocity = 0.0
+
+        minimum, maximum = self._scroll_bar.minimum(), self._scroll_bar.maximum()
+        self._position = max(minimum, min(self._position + distance, maximum))
+        if self._position in (minimum, maximum):
+            self._velocity = 0.0
+
+        self._scroll_bar.setValue(round(self._position))
+
+        if self._velocity == 0.0:
+            self.stop()
+
+
 class FSmoothScrollBar(FScrollBar):
     def __init__(self, orientation: Qt.Orientation, parent: QAbstractScrollArea):
         super().__init__(orientation, parent)
@@ -438,9 +759,19 @@ class FSmoothScrollBar(FScrollBar):
         self._vertical_duration = 240
         self._horizontal_scroll_rate = 60
         self._horizontal_duration = 480
+        self._kinetic_scroller = None  # type: KineticScroller | None
+
+        # 同一帧内的滚轮事件合并为一次动画调整
+        self._is_wheel_coalescing = False
+        self._pending_wheel_delta = 0
+        self._wheel_event_count = 0
+        self._animation_start_count = 0
 
         parent.viewport().installEventFilter(self)
         self.installEventFilter(self)
+        self.destroyed.connect(
+            partial(get_frame_clock().unsubscribe, self._on_wheel_frame)
+        )
 
     def scrollRate(self) -> int:
         if self._orientation == Qt.Orientation.Vertical:
@@ -454,35 +785,125 @@ class FSmoothScrollBar(FScrollBar):
         else:
             self._horizontal_scroll_rate = rate
 
+    def isKineticScrolling(self) -> bool:
+        return self._kinetic_scroller is not None
+
+    def setKineticScrolling(self, enabled: bool) -> None:
+        """使用惯性滚动代替默认的滚动动画，并支持触控板的像素增量"""
+
+        if enabled == self.isKineticScrolling():
+            return
+
+        if enabled:
+            self.animation.stop()
+            self._kinetic_scroller = KineticScroller(self)
+        else:
+            self._kinetic_scroller.stop()
+            self._kinetic_scroller.deleteLater()
+            self._kinetic_scroller = None
+
+    def wheelEventCount(self) -> int:
+        return self._wheel_event_count
+
+    def animationStartCount(self) -> int:
+        return self._animation_start_count
+
+    def resetCounters(self) -> None:
+        self._wheel_event_count = 0
+        self._animation_start_count = 0
+
     def scrollByValue(self, dv: int) -> None:
-        self.animation.stop()
+        # 动画进行中时从当前位置重新出发并延长终点，不重启动画
+        if self.animation.state() == QPropertyAnimation.State.Running:
+            end = self.animation.endValue() + dv
+            self.animation.setStartValue(self._value)
+            self.animation.setEndValue(max(self._minimum, min(end, self._maximum)))
+            self.animation.setCurrentTime(0)
+            return
 
         if self._orientation == Qt.Orientation.Vertical:
             self.animation.setDuration(self._vertical_duration)
         else:
             self.animation.setDuration(self._horizontal_duration)
 
+        end = max(self._minimum, min(self._value + dv, self._maximum))
+        if end == self._value:
+            return
+
         self.animation.setStartValue(self._value)
-        self.animation.setEndValue(self._value + dv)
+        self.animation.setEndValue(end)
         self.animation.start()
+        self._animation_start_count += 1
 
     def eventFilter(self, watched: QObject, event: QEvent) -> bool:
-        is_obj = watched is self.parent().viewport() or watched is self
-        if is_obj and isinstance(event, QWheelEvent):
+        # 先判断事件类型，父控件析构过程中收到的其他事件不能再访问viewport
+        is_obj = isinstance(event, QWheelEvent) and (
+            watched is self or watched is self.parent().viewport()
+        )
+        if is_obj and self.isKineticScrolling():
+            return self._kinetic_scroll(event)
+        elif is_obj:
             delta = event.angleDelta()
             if self._orientation == Qt.Orientation.Vertical and delta.y() != 0:
                 if delta.y() < 0:
                     dv = self._vertical_scroll_rate
                 else:
                     dv = -self._vertical_scroll_rate
-                self.scrollByValue(dv)
+                self._scroll_by_wheel(dv)
                 return True
             elif self._orientation == Qt.Orientation.Horizontal and delta.x() != 0:
                 if delta.x() < 0:
                     dv = self._horizontal_scroll_rate
                 else:
                     dv = -self._horizontal_scroll_rate
-                self.scrollByValue(dv)
+                self._scroll_by_wheel(dv)
                 return True
 
         return super().eventFilter(watched, event)
+
+    def _scroll_step(self, dv: int) -> None:
+        if self.isKineticScrolling():
+            self._kinetic_scroller.scrollByPixels(dv)
+        else:
+            self.scrollByValue(dv)
+
+    def _kinetic_scroll(self, event: QWheelEvent) -> bool:
+        if self._orientation == Qt.Orientation.Vertical:
+            pixel_delta, angle_delta = event.pixelDelta().y(), event.angleDelta().y()
+        else:
+            pixel_delta, angle_delta = event.pixelDelta().x(), event.angleDelta().x()
+
+        # 一格滚轮的angleDelta为120，对应scrollRate；像素增量按同样的比例换算
+        rate = self.scrollRate() / 120
+        if pixel_delta != 0 or angle_delta != 0:
+            self._wheel_event_count += 1
+
+        if pixel_delta != 0:
+            self._kinetic_scroller.scrollByPixels(-pixel_delta * rate)
+        elif angle_delta != 0:
+            self._kinetic_scroller.scrollBy(-angle_delta * rate)
+        else:
+            return False
+
+        return True
+
+    def _scroll_by_wheel(self, dv: int) -> None:
+        self._wheel_event_count += 1
+
+        # 本帧已调整过动画，先累加，到下一帧再一并处理
+        if self._is_wheel_coalescing:
+            self._pending_wheel_delta += dv
+            return
+
+        self.scrollByValue(dv)
+        self._is_wheel_coalescing = True
+        get_frame_clock().subscribe(self._on_wheel_frame)
+
+    def _on_wheel_frame(self, dt: float) -> None:
+        dv, self._pending_wheel_delta = self._pending_wheel_delta, 0
+        if dv != 0:
+            self.scrollByValue(dv)
+            return
+
+        self._is_wheel_coalescing = False
+        get_frame_clock().unsubscribe(self._on_wheel_frame)
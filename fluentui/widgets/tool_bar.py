@@ -2,7 +2,7 @@ from PySide6.QtCore import QRect, QSize, Qt
 from PySide6.QtGui import QColor, QIcon, QPainter, QPaintEvent
 from PySide6.QtWidgets import QWidget
 
-from ..utils import FAction, draw_icon, set_font
+from ..utils import FAction, draw_icon, font_metrics, set_font
 from .button import ToolButton
 from .tool_tip import FToolTipFilter
 
@@ -34,7 +34,7 @@ class FToolButton(ToolButton):
             return QSize(36, 24) if self._is_tight else QSize(48, 34)
 
         # get the width of text
-        tw = self.fontMetrics().boundingRect(self._text).width()
+        tw = font_metrics(self.font()).boundingRect(self._text).width()
 
         style = self.toolButtonStyle()
         if style == Qt.ToolButtonStyle.ToolButtonTextOnly:
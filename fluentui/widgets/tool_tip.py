@@ -11,13 +11,12 @@ from PySide6.QtCore import (
 from PySide6.QtGui import QColor, QHideEvent, QShowEvent
 from PySide6.QtWidgets import (
     QFrame,
-    QGraphicsDropShadowEffect,
     QHBoxLayout,
     QLabel,
     QWidget,
 )
 
-from fluentui.utils import FStyleSheet, get_screen_geometry, set_font
+from fluentui.utils import FShadowEffect, FStyleSheet, get_screen_geometry, set_font
 
 
 class ToolTipPosition(Enum):
@@ -56,11 +55,11 @@ class FToolTip(QWidget):
         self.animation = QPropertyAnimation(self, b"windowOpacity", self)
         self.animation.setDuration(150)
 
-        self.shadow_effect = QGraphicsDropShadowEffect(self)
+        self.shadow_effect = FShadowEffect(self.container)
         self.shadow_effect.setBlurRadius(25)
         self.shadow_effect.setColor(QColor(0, 0, 0, 60))
         self.shadow_effect.setOffset(0, 5)
-        self.container.setGraphicsEffect(self.shadow_effect)
+        self.shadow_effect.setBorderRadius(4)
 
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)
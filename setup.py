@@ -0,0 +1,37 @@
+import os
+import shutil
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+QRC_PATH = os.path.join("fluentui", "resources", "resources.qrc")
+
+
+class BuildPy(build_py):
+    """构建时编译Qt资源
+
+    同时生成供QResource.registerResource内存映射的resources.rcc，
+    以及作为备用的resources_rc模块，两者均使用zlib压缩
+
+    """
+
+    def run(self) -> None:
+        super().run()
+
+        if not self.dry_run:
+            self._compile_resources()
+
+    def _compile_resources(self) -> None:
+        rcc = shutil.which("pyside6-rcc")
+        if rcc is None:
+            raise RuntimeError("pyside6-rcc is required to build fluentui")
+
+        output_dir = os.path.join(self.build_lib, "fluentui", "resources")
+        self.mkpath(output_dir)
+
+        args = [rcc, "--compress-algo", "zlib", QRC_PATH]
+        self.spawn([*args, "--binary", "-o", os.path.join(output_dir, "resources.rcc")])
+        self.spawn([*args, "-o", os.path.join(output_dir, "resources_rc.py")])
+
+
+setup(cmdclass={"build_py": BuildPy})
@@ -0,0 +1,30 @@
+import gc
+
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from fluentui.utils import FIcon
+
+app = QApplication.instance() or QApplication()
+
+
+def test_modify_copied_icon() -> None:
+    # 修改共享图标的副本时QIcon会clone IconEngine，clone出的对象被回收后会导致崩溃
+    icons = []
+    for _ in range(20):
+        icon = QIcon(FIcon.ADD.icon())
+        icon.addPixmap(QPixmap(8, 8))
+        icons.append(icon)
+
+        icon = QIcon(FIcon.EDIT.icon())
+        icon.addFile(":/nonexistent.png")
+        icons.append(icon)
+        gc.collect()
+
+    for icon in icons:
+        assert not icon.pixmap(16, 16).isNull()
+
+
+if __name__ == "__main__":
+    test_modify_copied_icon()
+    print("ok")